@@ -6,7 +6,6 @@
 """
 
 import sys
-import traceback
 from src.gui.email_sender_window import EmailSenderWindow
 from src.utils.logger import setup_logger
 
@@ -38,10 +37,6 @@ def main():
         error_msg = f"程序发生未处理的异常: {str(e)}"
         logger.critical(error_msg, exc_info=True)
         
-        # 获取详细的堆栈跟踪
-        stack_trace = traceback.format_exc()
-        logger.critical(f"堆栈跟踪:\n{stack_trace}")
-        
         # 确保错误信息被记录后再退出
         sys.exit(1)
 
@@ -25,9 +25,16 @@ class ParameterPanel(ttk.LabelFrame):
     
     Attributes:
         on_params_change: 参数变更的回调函数
-        param_frames: 参数行的Frame字典
+        param_tree: 自定义参数列表，每个参数一行，行ID为参数标识符
+        DELETE_COLUMN: 删除列的列号
+        NOTIFY_DELAY_MS: 参数变更通知的合并窗口（毫秒）
     """
     
+    # 删除列（第三列）的列号，用于识别点击位置
+    DELETE_COLUMN = "#3"
+    # 参数变更通知的合并窗口（毫秒）
+    NOTIFY_DELAY_MS = 50
+    
     def __init__(self, parent):
         """
         初始化参数设置面板
@@ -39,7 +46,8 @@ class ParameterPanel(ttk.LabelFrame):
         logger.info("初始化参数设置面板")
         
         self.on_params_change: Optional[Callable[[List[str], Dict[str, str]], None]] = None
-        self.param_frames: Dict[str, ttk.Frame] = {}  # 存储参数行的Frame
+        self._editing_enabled = True  # 是否允许删除参数
+        self._pending_notify: Optional[str] = None  # 待执行的参数变更通知
         self._init_ui()
         logger.debug("参数设置面板初始化完成")
 
@@ -65,9 +73,22 @@ class ParameterPanel(ttk.LabelFrame):
         self.params_container = ttk.Frame(self)
         self.params_container.pack(fill="x", padx=5)
         
-        # 自定义参数的框架
-        self.custom_params_frame = ttk.Frame(self.params_container)
-        self.custom_params_frame.pack(fill="x", pady=5)
+        # 自定义参数列表，点击"×"列删除参数
+        self.param_tree = ttk.Treeview(
+            self.params_container,
+            columns=("display", "id", "del"),
+            show="headings",
+            height=6,
+            selectmode="none"
+        )
+        self.param_tree.heading("display", text="显示名称")
+        self.param_tree.heading("id", text="参数标识")
+        self.param_tree.heading("del", text="")
+        self.param_tree.column("display", width=90)
+        self.param_tree.column("id", width=90)
+        self.param_tree.column("del", width=30, stretch=False, anchor="center")
+        self.param_tree.pack(fill="x", pady=5)
+        self.param_tree.bind("<Button-1>", self._on_param_tree_click)
         
         # 添加参数按钮
         self.add_param_btn = ttk.Button(self.params_container, text="添加参数", command=self.add_param)
@@ -84,7 +105,7 @@ class ParameterPanel(ttk.LabelFrame):
             self._create_param_row(display_name, identifier)
         logger.debug("自定义参数显示恢复完成")
 
-    def _create_param_row(self, display_name: str, identifier: str) -> ttk.Frame:
+    def _create_param_row(self, display_name: str, identifier: str) -> str:
         """
         创建参数行
         
@@ -93,39 +114,43 @@ class ParameterPanel(ttk.LabelFrame):
             identifier: 参数标识符
             
         Returns:
-            ttk.Frame: 参数行的Frame
+            str: 参数行在列表中的ID（即参数标识符）
         """
         logger.debug(f"创建参数行 - 显示名称: {display_name}, 标识符: {identifier}")
+        return self.param_tree.insert(
+            "", "end", iid=identifier,
+            values=(display_name, f"{{{identifier}}}", "×")
+        )
+
+    def _on_param_tree_click(self, event) -> Optional[str]:
+        """
+        处理参数列表的点击事件，点击"×"列时移除对应参数
         
-        # 创建参数行
-        row_frame = ttk.Frame(self.custom_params_frame)
-        row_frame.pack(fill="x", pady=2)
-        
-        # 显示参数信息
-        param_text = f"{display_name}: {{{identifier}}}"
-        ttk.Label(row_frame, text=param_text).pack(side="left", padx=2)
-        
-        def remove_param():
-            """移除参数"""
-            logger.info(f"移除参数 - 标识符: {identifier}")
-            if ParameterService.remove_param(identifier):
-                row_frame.destroy()
-                del self.param_frames[identifier]
-                # 如果是最后一个参数被删除，重新调整custom_params_frame的大小
-                if not self.param_frames:
-                    self.custom_params_frame.pack_forget()
-                    self.custom_params_frame.pack(fill="x", pady=5)
-                self._notify_params_change()
-                logger.debug("参数移除成功")
-        
-        # 添加删除按钮
-        remove_btn = ttk.Button(row_frame, text="×", width=3, command=remove_param)
-        remove_btn.pack(side="right", padx=2)
-        
-        # 保存Frame引用
-        self.param_frames[identifier] = row_frame
+        Args:
+            event: 鼠标点击事件对象
+            
+        Returns:
+            Optional[str]: 点击删除列时返回"break"，阻止默认处理
+        """
+        if self.param_tree.identify_column(event.x) != self.DELETE_COLUMN:
+            return None
+        identifier = self.param_tree.identify_row(event.y)
+        if identifier and self._editing_enabled:
+            self._remove_param(identifier)
+        return "break"
+
+    def _remove_param(self, identifier: str):
+        """
+        移除参数
         
-        return row_frame
+        Args:
+            identifier: 参数标识符
+        """
+        logger.info(f"移除参数 - 标识符: {identifier}")
+        if ParameterService.remove_param(identifier):
+            self.param_tree.delete(identifier)
+            self._notify_params_change()
+            logger.debug("参数移除成功")
 
     def save_param(self, name: str, identifier: str, dialog: tk.Toplevel) -> bool:
         """
@@ -170,11 +195,11 @@ class ParameterPanel(ttk.LabelFrame):
         """添加新的自定义参数"""
         logger.info("打开添加参数对话框")
         
-        # 创建弹窗
+        # 创建弹窗，布局完成前先隐藏，避免先绘制再移动
         dialog = tk.Toplevel(self)
+        dialog.withdraw()
         dialog.title("添加自定义参数")
         dialog.transient(self)
-        dialog.grab_set()
         
         # 创建主框架
         main_frame = ttk.Frame(dialog, padding=(20, 20, 20, 10))
@@ -220,11 +245,7 @@ class ParameterPanel(ttk.LabelFrame):
         # 绑定回车键
         dialog.bind('<Return>', lambda e: save())
         
-        # 设置焦点
-        name_entry.focus()
-        
         # 调整窗口大小和位置
-        dialog.update_idletasks()
         window_width = 400
         window_height = 150
         screen_width = dialog.winfo_screenwidth()
@@ -232,6 +253,11 @@ class ParameterPanel(ttk.LabelFrame):
         x = (screen_width - window_width) // 2
         y = (screen_height - window_height) // 2
         dialog.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        dialog.deiconify()
+        
+        # 窗口显示后才能设置模态和焦点
+        dialog.grab_set()
+        name_entry.focus()
         
         logger.debug("添加参数对话框创建完成")
 
@@ -241,11 +267,9 @@ class ParameterPanel(ttk.LabelFrame):
         # 禁用添加参数按钮
         self.add_param_btn.configure(state="disabled")
         
-        # 禁用所有现有参数的删除按钮
-        for frame in self.param_frames.values():
-            for child in frame.winfo_children():
-                if isinstance(child, ttk.Button):
-                    child.configure(state="disabled")
+        # 禁用参数列表中的删除操作
+        self._editing_enabled = False
+        self.param_tree.state(["disabled"])
 
     def enable_editing(self):
         """启用参数编辑"""
@@ -253,11 +277,9 @@ class ParameterPanel(ttk.LabelFrame):
         # 启用添加参数按钮
         self.add_param_btn.configure(state="normal")
         
-        # 启用所有现有参数的删除按钮
-        for frame in self.param_frames.values():
-            for child in frame.winfo_children():
-                if isinstance(child, ttk.Button):
-                    child.configure(state="normal")
+        # 启用参数列表中的删除操作
+        self._editing_enabled = True
+        self.param_tree.state(["!disabled"])
 
     def set_params_change_callback(self, callback: Callable[[List[str], Dict[str, str]], None]):
         """
@@ -269,7 +291,18 @@ class ParameterPanel(ttk.LabelFrame):
         self.on_params_change = callback
 
     def _notify_params_change(self):
-        """通知参数变化"""
+        """
+        通知参数变化
+        
+        在短时间内连续增删参数时只通知最后一次变更。
+        """
+        if self._pending_notify:
+            self.after_cancel(self._pending_notify)
+        self._pending_notify = self.after(self.NOTIFY_DELAY_MS, self._do_notify_params_change)
+
+    def _do_notify_params_change(self):
+        """执行参数变化通知"""
+        self._pending_notify = None
         try:
             if self.on_params_change:
                 # 获取参数标识符列表
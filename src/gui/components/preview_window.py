@@ -5,15 +5,56 @@
 包括标题和内容的预览，支持HTML格式显示，提供翻页功能。
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk
-from typing import List, Dict
-from tkhtmlview import HTMLScrolledText
+from typing import List, Dict, FrozenSet, Optional, Tuple
 from src.services.template_service import TemplateService
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# 只读文本框使用的绑定标签，拦截编辑操作但保留选择、复制和光标移动
+READONLY_BINDTAG = "PreviewReadOnlyText"
+# 只读文本框中允许的按键
+READONLY_ALLOWED_KEYS = {"Left", "Right", "Up", "Down", "Home", "End", "Prior", "Next"}
+# Tk 事件状态中 Control 键的掩码
+CONTROL_MASK = 0x4
+
+
+def _block_edit_key(event) -> Optional[str]:
+    """
+    拦截只读文本框中的编辑按键
+    
+    Args:
+        event: 键盘事件对象
+        
+    Returns:
+        Optional[str]: 需要拦截时返回"break"
+    """
+    if event.keysym in READONLY_ALLOWED_KEYS:
+        return None
+    if event.state & CONTROL_MASK and event.keysym.lower() == "c":
+        return None
+    return "break"
+
+
+def make_readonly(widget: tk.Text):
+    """
+    将文本框设为只读
+    
+    在类绑定之前插入只读绑定标签来拦截键盘编辑和粘贴，文本框保持 normal 状态，
+    程序更新内容时无需来回切换 state。
+    
+    Args:
+        widget: 文本框组件
+    """
+    widget.bind_class(READONLY_BINDTAG, "<Key>", _block_edit_key)
+    for sequence in ("<<Paste>>", "<<PasteSelection>>", "<<Cut>>", "<<Clear>>"):
+        widget.bind_class(READONLY_BINDTAG, sequence, lambda e: "break")
+    widget.bindtags((str(widget), READONLY_BINDTAG) + widget.bindtags()[1:])
+    widget.configure(insertontime=0)  # 隐藏插入光标
+
 class PreviewWindow(tk.Toplevel):
     """
     邮件预览窗口类
@@ -32,6 +73,11 @@ class PreviewWindow(tk.Toplevel):
         template_service: 模板服务实例
         is_html_view: 是否为HTML渲染视图（仅HTML模式）
         current_html: 当前的HTML内容（仅HTML模式）
+        _template_params: 模板中使用的参数集合
+        _missing_params_cache: 按收件人列集合缓存的未定义参数列表
+        _formats: 主题、正文和HTML的格式串（纯文本模式下HTML格式串为空）
+        _render_cache: 按页码缓存的渲染结果 (主题, 正文, HTML)
+        _render_version: 渲染缓存对应的模板版本号
     """
     
     def __init__(self, parent, preview_data: List[Dict[str, str]], 
@@ -52,17 +98,21 @@ class PreviewWindow(tk.Toplevel):
         self.template_service = template_service
         
         # 获取模板格式
-        template_data = template_service.get_template()
-        self.is_html = template_data['is_html']
+        self.is_html = template_service.get_template()['is_html']
         
         # 仅在HTML模式下初始化相关属性
         if self.is_html:
             self.is_html_view = True  # 默认显示HTML渲染视图
             self.current_html = ""    # 存储当前的HTML内容
+            self._last_rendered_html: Optional[str] = None  # 渲染视图中已显示的HTML
+            self._last_source_html: Optional[str] = None    # 源码视图中已显示的HTML
         
         self.current_page = 0
         self.total_pages = len(preview_data)
         
+        # 模板数据、参数和格式串只在模板变更时重新生成，渲染结果按页缓存
+        self._load_template_state()
+        
         # 设置窗口大小和位置
         window_width = 800
         window_height = 600
@@ -74,6 +124,13 @@ class PreviewWindow(tk.Toplevel):
         
         self._init_ui()
         self.update_preview()
+        
+        # 后台预渲染其余页面，翻页时直接读取缓存
+        threading.Thread(
+            target=self._prerender_all,
+            args=(self._render_cache, self._formats),
+            daemon=True
+        ).start()
         logger.debug("预览窗口初始化完成")
 
     def _init_ui(self):
@@ -103,13 +160,13 @@ class PreviewWindow(tk.Toplevel):
         content_frame.pack(fill="both", expand=True)
         
         # 根据模板格式创建不同的视图
-        template_data = self.template_service.get_template()
-        self.is_html = template_data['is_html']
-        
         if self.is_html:
             # HTML模式：创建渲染视图和源码视图
+            # 仅HTML模式需要tkhtmlview，延迟导入以减少纯文本预览的加载开销
+            from tkhtmlview import HTMLScrolledText
             self.html_view = HTMLScrolledText(content_frame)
             self.source_view = tk.Text(content_frame, wrap="word", padx=5, pady=5)
+            make_readonly(self.source_view)
             scrollbar = ttk.Scrollbar(content_frame, orient="vertical", 
                                     command=self.source_view.yview)
             self.source_view.configure(yscrollcommand=scrollbar.set)
@@ -127,7 +184,7 @@ class PreviewWindow(tk.Toplevel):
             scrollbar.pack(side="right", fill="y")
             self.text_view.pack(side="left", fill="both", expand=True)
             # 设置只读
-            self.text_view.configure(state="disabled")
+            make_readonly(self.text_view)
         
         # 导航区域
         nav_frame = ttk.Frame(main_frame)
@@ -137,6 +194,10 @@ class PreviewWindow(tk.Toplevel):
         self.page_label = ttk.Label(nav_frame, text="")
         self.page_label.pack(side="left", padx=20)
         
+        # 参数校验提示，不弹出模态对话框以免打断翻页
+        self.warn_label = ttk.Label(nav_frame, text="", foreground="red")
+        self.warn_label.pack(side="left")
+        
         # 导航按钮
         btn_frame = ttk.Frame(nav_frame)
         btn_frame.pack(side="right")
@@ -169,19 +230,34 @@ class PreviewWindow(tk.Toplevel):
             # 切换到源码视图
             self.html_view.pack_forget()
             self.source_view.pack(side="left", fill="both", expand=True)
-            self.source_view.configure(state="normal")
-            self.source_view.delete("1.0", tk.END)
-            self.source_view.insert("1.0", self.current_html)
-            self.source_view.configure(state="disabled")
+            self._show_source_html()
             self.view_btn.configure(text="查看渲染效果")
         else:
             # 切换回HTML渲染视图
             self.source_view.pack_forget()
             self.html_view.pack(fill="both", expand=True)
+            self._show_rendered_html()
             self.view_btn.configure(text="查看HTML源码")
         
         self.is_html_view = not self.is_html_view
 
+    def _show_rendered_html(self):
+        """在渲染视图中显示当前HTML，内容未变化时跳过重新解析"""
+        if self.current_html == self._last_rendered_html:
+            return
+        self.html_view.configure(state="normal")
+        self.html_view.set_html(self.current_html)
+        self.html_view.configure(state="disabled")
+        self._last_rendered_html = self.current_html
+
+    def _show_source_html(self):
+        """在源码视图中显示当前HTML，内容未变化时跳过重新插入"""
+        if self.current_html == self._last_source_html:
+            return
+        self.source_view.delete("1.0", tk.END)
+        self.source_view.insert("1.0", self.current_html)
+        self._last_source_html = self.current_html
+
     def update_preview(self):
         """更新预览内容，并校验参数"""
         logger.debug(f"更新预览内容 - 当前页: {self.current_page + 1}")
@@ -190,40 +266,37 @@ class PreviewWindow(tk.Toplevel):
             # 获取当前收件人数据
             recipient = self.preview_data[self.current_page]
             
-            # 获取模板数据
-            template_data = self.template_service.get_template()
+            # 模板变更后重新加载模板状态，渲染缓存失效
+            if self.template_service.version != self._render_version:
+                self._load_template_state()
             
             # 校验参数
-            missing_params = self._validate_params(template_data, recipient)
+            missing_params = self._validate_params(recipient)
+            error_msg = ""
             if missing_params:
                 error_msg = f"以下参数未定义: {', '.join(missing_params)}"
                 logger.warning(f"参数校验失败: {error_msg}")
-                tk.messagebox.showwarning("参数校验", error_msg)
+            self.warn_label.configure(text=error_msg)
             
-            # 替换变量
-            subject = TemplateService.replace_variables(template_data['subject'], recipient)
-            content = TemplateService.replace_variables(template_data['content'], recipient)
+            # 替换变量（优先使用缓存的渲染结果）
+            rendered = self._render_cache.get(self.current_page)
+            if rendered is None:
+                rendered = self._render_page(self._formats, recipient)
+                self._render_cache[self.current_page] = rendered
+            subject, content, html_content = rendered
             
-            if template_data['is_html']:
+            if self.is_html:
                 # HTML模式：更新当前HTML内容
-                self.current_html = TemplateService.replace_variables(self.template_service.get_html_content(), recipient)
+                self.current_html = html_content
                 # 更新当前显示的视图
                 if self.is_html_view:
-                    self.html_view.configure(state="normal")
-
-                    self.html_view.set_html(self.current_html)
-                    self.html_view.configure(state="disabled")
+                    self._show_rendered_html()
                 else:
-                    self.source_view.configure(state="normal")
-                    self.source_view.delete("1.0", tk.END)
-                    self.source_view.insert("1.0", self.current_html)
-                    self.source_view.configure(state="disabled")
+                    self._show_source_html()
             else:
                 # 纯文本模式：直接显示替换变量后的内容
-                self.text_view.configure(state="normal")  # 临时启用编辑
                 self.text_view.delete("1.0", tk.END)
                 self.text_view.insert("1.0", content)
-                self.text_view.configure(state="disabled")  # 恢复只读
             
             # 更新显示
             self.subject_label.configure(text=subject)
@@ -246,29 +319,77 @@ class PreviewWindow(tk.Toplevel):
             logger.error(f"更新预览内容时出错: {str(e)}", exc_info=True)
             tk.messagebox.showerror("错误", f"更新预览内容时出错: {str(e)}")
 
-    def _validate_params(self, template_data: Dict, recipient: Dict) -> List[str]:
+    def _load_template_state(self):
         """
-        校验模板中使用的参数是否都已定义
+        从模板服务加载模板状态
+        
+        解析模板参数并生成格式串，同时清空渲染缓存。
+        缓存字典被整体替换，后台预渲染线程写入的旧结果不会混入新缓存。
+        """
+        template_data = self.template_service.get_template()
+        subject = template_data['subject']
+        content = template_data['content']
+        self._template_params = TemplateService.get_template_params(subject, content)
+        self._missing_params_cache: Dict[FrozenSet[str], List[str]] = {}
+        html_src = self.template_service.get_html_content() if self.is_html else ""
+        self._formats = tuple(
+            TemplateService.compile_format(text) for text in (subject, content, html_src)
+        )
+        self._render_cache: Dict[int, Tuple[str, str, str]] = {}
+        self._render_version = self.template_service.version
+
+    @staticmethod
+    def _render_page(formats: Tuple[str, str, str], recipient: Dict) -> Tuple[str, str, str]:
+        """
+        渲染单个收件人的邮件内容
         
         Args:
-            template_data: 模板数据
+            formats: 主题、正文和HTML的格式串
             recipient: 收件人数据
             
         Returns:
-            List[str]: 未定义的参数列表
+            Tuple[str, str, str]: (主题, 正文, HTML内容)，纯文本模式下HTML内容为空字符串
         """
-        # 从模板中提取所有参数
-        template_params = TemplateService.get_template_params(
-            template_data['subject'],
-            template_data['content']
-        )
+        return tuple(TemplateService.render_format(fmt, recipient) for fmt in formats)
+
+    def _prerender_all(self, cache: Dict[int, Tuple[str, str, str]],
+                       formats: Tuple[str, str, str]):
+        """
+        在后台线程中预渲染所有预览页面
         
-        # 检查每个参数是否在收件人数据中定义
-        missing_params = []
-        for param in template_params:
-            if param not in recipient:
-                missing_params.append(param)
+        只进行字符串替换，不访问任何界面组件。模板变更时缓存字典会被整体替换，
+        因此本线程写入的旧结果不会污染新缓存。
         
+        Args:
+            cache: 要填充的渲染缓存
+            formats: 开始预渲染时的格式串
+        """
+        logger.debug(f"开始预渲染预览页面，共 {self.total_pages} 页")
+        for index, recipient in enumerate(self.preview_data):
+            if cache is not self._render_cache:
+                logger.debug("模板已变更，停止预渲染")
+                return
+            if index not in cache:
+                cache[index] = self._render_page(formats, recipient)
+        logger.debug("预览页面预渲染完成")
+
+    def _validate_params(self, recipient: Dict) -> List[str]:
+        """
+        校验模板中使用的参数是否都已定义
+        
+        同一批收件人通常具有相同的列，校验结果按收件人的列集合缓存。
+        
+        Args:
+            recipient: 收件人数据
+            
+        Returns:
+            List[str]: 未定义的参数列表
+        """
+        keys = frozenset(recipient)
+        missing_params = self._missing_params_cache.get(keys)
+        if missing_params is None:
+            missing_params = sorted(self._template_params - keys)
+            self._missing_params_cache[keys] = missing_params
         return missing_params
 
     def prev_page(self):
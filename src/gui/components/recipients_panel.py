@@ -5,7 +5,9 @@
 支持CSV文件的导入导出，双击编辑单个收件人信息，以及实时显示发送状态。
 """
 
+import re
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk, filedialog, messagebox
 from typing import List, Dict, Set, Optional, Callable, Tuple
 
@@ -16,6 +18,17 @@ from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# 邮箱格式校验：本地部分@域名，域名中至少包含一个点，且不含空白字符
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# 在一次Tcl调用中批量设置多行的值和标签，避免每行一次Python到Tcl的调用开销
+_TCL_SET_ROW_VALUES = ("{tree iids rows tags} {foreach iid $iids row $rows tag $tags "
+                       "{$tree item $iid -values $row -tags $tag}}")
+# 在一次Tcl调用中批量插入第 start 到 end-1 个空行，行ID为 slot<序号>，返回新行的ID列表
+_SLOT_PREFIX = "slot"
+_TCL_INSERT_ROWS = ("{tree start end} {set iids {}; for {set i $start} {$i < $end} {incr i} "
+                    "{lappend iids [$tree insert {} end -id " + _SLOT_PREFIX + "$i]}; return $iids}")
+
 class RecipientsPanel(ttk.LabelFrame):
     """
     收件人列表面板类
@@ -32,6 +45,16 @@ class RecipientsPanel(ttk.LabelFrame):
         current_columns: 当前显示的列
         template_params: 模板中使用的参数集合
         on_import: 导入完成的回调函数
+        _rows: 表格展示的全部数据
+        _row_start: 可见窗口第一行对应的数据索引
+        _slot_iids: 表格中复用的行ID，第i行的ID为 slot<i>，显示 _rows[_row_start + i]
+        _page_size: 可见区域能容纳的行数
+        _email_to_index: 邮箱到数据索引的映射，邮箱重复时指向第一条
+        _pending_status: 等待刷新到表格的状态更新，数据索引到状态的映射
+        _display_names: 当前各列的显示名称，列配置变化时更新
+        _display_fields: 编辑窗口中可编辑的 (列, 显示名称) 列表
+        _max_label_width: 编辑窗口中标签的宽度
+        _column_widths: 列的默认宽度
     """
     
     # 状态列配置
@@ -40,6 +63,27 @@ class RecipientsPanel(ttk.LabelFrame):
         'display_name': '发送状态',
         'width': 80
     }
+
+    # 发送状态对应的行标签及其文字颜色
+    STATUS_TAGS = {
+        '待发送': 'pending',
+        '发送中': 'sending',
+        '已发送': 'sent',
+        '发送失败': 'failed'
+    }
+    TAG_COLORS = {
+        'pending': 'gray',
+        'sending': 'blue',
+        'sent': 'green',
+        'failed': 'red'
+    }
+
+    # 表格虚拟化配置：表格中只保留可见区域的行，滚动时复用这些行显示不同的数据
+    DEFAULT_ROW_HEIGHT = 20  # 无法测量时使用的行高
+    DEFAULT_HEADING_HEIGHT = 25  # 无法测量时使用的表头高度
+    WHEEL_STEP = 3  # 鼠标滚轮每次滚动的行数
+    IMPORT_POLL_MS = 100  # 导入过程中刷新已解析数据的间隔（毫秒）
+    STATUS_MESSAGE_MS = 3000  # 状态栏提示信息的显示时长（毫秒）
     
     def __init__(self, parent):
         """
@@ -52,11 +96,25 @@ class RecipientsPanel(ttk.LabelFrame):
         logger.info("初始化收件人列表面板")
         
         self.service = RecipientsService()
+        self._column_widths = ParameterService.get_column_widths()
         # 获取参数列并添加状态列
         param_columns = ParameterService.get_display_columns([])
         self.current_columns = param_columns + [self.STATUS_COLUMN['id']]
+        self._refresh_display_names()
         self.template_params: Set[str] = set()  # 存储模板参数
         self.on_import: Optional[Callable[[bool], None]] = None  # 导入回调函数
+        self._rows: List[Dict[str, str]] = []
+        self._row_start = 0
+        self._slot_iids: List[str] = []
+        self._page_size = 1
+        self._render_pending = False
+        self._email_to_index: Dict[str, int] = {}
+        self._indexed_rows = 0
+        self._pending_status: Dict[int, str] = {}
+        self._status_flush_scheduled = False
+        self._io_pool = ThreadPoolExecutor(max_workers=1)  # 后台解析CSV文件
+        self._importing = False  # 后台导入进行中，表格显示的不是服务中的数据
+        self._status_clear_id: Optional[str] = None
         self._init_ui()
         logger.debug("收件人列表面板初始化完成")
 
@@ -77,15 +135,27 @@ class RecipientsPanel(ttk.LabelFrame):
         # 更新列显示
         param_columns = ParameterService.get_display_columns(params)
         self.current_columns = param_columns + [self.STATUS_COLUMN['id']]
+        self._refresh_display_names()
         
         logger.debug(f"更新后的列配置: {self.current_columns}")
         
-        # 重新创建表格
-        self.create_treeview()
+        # 更新表格列，列变化时会重新渲染可见行
+        self._apply_columns()
+
+    def _refresh_display_names(self) -> None:
+        """
+        缓存当前各列的显示名称，在列配置变化后调用
         
-        # 刷新数据显示
-        if self.service.get_recipients():
-            self.refresh_treeview(self.service.get_recipients())
+        同时缓存编辑窗口使用的可编辑字段列表和标签宽度。
+        """
+        self._display_fields = [
+            (col, ParameterService.get_column_display_name(col))
+            for col in self.current_columns if col != self.STATUS_COLUMN['id']
+        ]
+        self._max_label_width = max((len(name) * 2 for _, name in self._display_fields),
+                                    default=10)  # 估算中文字符宽度
+        self._display_names = dict(self._display_fields)
+        self._display_names[self.STATUS_COLUMN['id']] = self.STATUS_COLUMN['display_name']
 
     def _init_ui(self):
         """初始化用户界面
@@ -107,33 +177,70 @@ class RecipientsPanel(ttk.LabelFrame):
         self.clear_btn = ttk.Button(toolbar, text="清空列表", command=self.clear_recipients)
         self.clear_btn.pack(side="right", padx=2)
         
+        # 状态栏，显示导入进度和操作结果，错误仍使用对话框提示
+        self.status_label = ttk.Label(self, text="")
+        self.status_label.pack(side="bottom", fill="x", padx=5, pady=(0, 5))
+        
         # 创建表格
-        self.create_treeview()
+        self._build_treeview_once()
         logger.debug("用户界面初始化完成")
 
-    def create_treeview(self):
+    def _build_treeview_once(self):
         """创建表格视图
         
-        创建或重新创建表格视图，设置列属性和事件绑定。
+        创建表格视图和滚动条并绑定事件，只在初始化时调用一次，
+        之后列配置变化时通过 _apply_columns 更新现有表格。
         包括：
         - 设置列宽和标题
         - 添加滚动条
-        - 绑定编辑事件
+        - 绑定编辑和滚动事件
         """
         logger.debug("开始创建表格视图")
         
-        # 如果已存在，先销毁表格和滚动条
-        if hasattr(self, 'recipients_tree'):
-            self.recipients_tree.destroy()
-        if hasattr(self, 'scrollbar'):
-            self.scrollbar.destroy()
+        self._slot_iids = []
+        self._scrollbar_position: Optional[Tuple[float, float]] = None
+        self._applied_columns: Tuple[str, ...] = ()
         
-        # 创建新表格
-        columns = self.current_columns
-        self.recipients_tree = ttk.Treeview(self, columns=columns, show="headings")
+        # 创建表格和滚动条，表格只包含可见的行，滚动位置由面板自行维护
+        self.recipients_tree = ttk.Treeview(self, show="headings")
+        for tag, color in self.TAG_COLORS.items():
+            self.recipients_tree.tag_configure(tag, foreground=color)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self._apply_columns()
+        self._update_scrollbar()
         
-        # 获取列宽度
-        column_widths = ParameterService.get_column_widths()
+        self.recipients_tree.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.scrollbar.pack(side="right", fill="y", pady=5)
+        
+        # 添加编辑功能
+        self.recipients_tree.bind('<Double-1>', self.on_double_click)
+        self.recipients_tree.bind('<Return>', self.on_double_click)
+        
+        # 窗口大小变化和滚动时重新渲染可见的行
+        self.recipients_tree.bind('<Configure>', lambda e: self._schedule_render())
+        self.recipients_tree.bind('<MouseWheel>', self._on_mouse_wheel)
+        self.recipients_tree.bind('<Button-4>', self._on_mouse_wheel)
+        self.recipients_tree.bind('<Button-5>', self._on_mouse_wheel)
+        self.recipients_tree.bind('<Up>', lambda e: self._on_arrow_key(-1))
+        self.recipients_tree.bind('<Down>', lambda e: self._on_arrow_key(1))
+        self.recipients_tree.bind('<Prior>', lambda e: self._on_page_key(-1))
+        self.recipients_tree.bind('<Next>', lambda e: self._on_page_key(1))
+        self.recipients_tree.bind('<Home>', lambda e: self._focus_row(0))
+        self.recipients_tree.bind('<End>', lambda e: self._focus_row(len(self._rows) - 1))
+        
+        logger.debug("表格视图创建完成")
+
+    def _apply_columns(self) -> None:
+        """
+        将当前列配置应用到现有表格
+        
+        更新列宽和标题。只有列发生增删时才重新配置表格的列并重新渲染可见行。
+        """
+        columns = tuple(self.current_columns)
+        if columns != self._applied_columns:
+            self.recipients_tree.configure(columns=columns)
+            self._applied_columns = columns
+            self._render_window(self._row_start)
         
         # 设置每列的属性
         for col in columns:
@@ -141,28 +248,11 @@ class RecipientsPanel(ttk.LabelFrame):
             if col == self.STATUS_COLUMN['id']:
                 width = self.STATUS_COLUMN['width']
             else:
-                width = column_widths.get(col, 150)  # 自定义参数使用更宽的默认宽度
+                width = self._column_widths.get(col, 150)  # 自定义参数使用更宽的默认宽度
             self.recipients_tree.column(col, width=width)
             
             # 设置列标题
-            if col == self.STATUS_COLUMN['id']:
-                display_name = self.STATUS_COLUMN['display_name']
-            else:
-                display_name = ParameterService.get_column_display_name(col)
-            self.recipients_tree.heading(col, text=display_name)
-        
-        # 添加滚动条
-        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.recipients_tree.yview)
-        self.recipients_tree.configure(yscrollcommand=self.scrollbar.set)
-        
-        self.recipients_tree.pack(side="left", fill="both", expand=True, padx=5, pady=5)
-        self.scrollbar.pack(side="right", fill="y", pady=5)
-        
-        # 添加编辑功能
-        self.recipients_tree.bind('<Double-1>', self.on_double_click)
-        self.recipients_tree.bind('<Return>', self.on_double_click)
-        
-        logger.debug("表格视图创建完成")
+            self.recipients_tree.heading(col, text=self._display_names[col])
 
     def update_columns(self, custom_params: List[str]) -> None:
         """更新表格列
@@ -174,41 +264,273 @@ class RecipientsPanel(ttk.LabelFrame):
             # 获取参数列并添加状态列
             param_columns = ParameterService.get_display_columns(custom_params)
             self.current_columns = param_columns + [self.STATUS_COLUMN['id']]
+            self._refresh_display_names()
             
-            print(f"更新列: {custom_params}")
-            print(f"当前列: {self.current_columns}")
+            logger.debug(f"更新列: {custom_params}")
+            logger.debug(f"当前列: {self.current_columns}")
             
-            # 重新创建表格
-            self.create_treeview()
+            # 更新表格列
+            self._apply_columns()
             
         except Exception as e:
-            print(f"更新列时出错: {str(e)}")
+            logger.error(f"更新列时出错: {str(e)}", exc_info=True)
             messagebox.showerror("错误", f"更新列失败: {str(e)}")
 
     def refresh_treeview(self, data: List[Dict[str, str]]):
         """
         刷新表格数据显示
         
-        清空当前表格内容，并使用新的数据重新填充表格。
+        使用新的数据替换表格内容。表格只渲染可见区域内的行，
+        因此刷新开销与数据总量无关。
         
         Args:
             data: 收件人数据列表，每个字典包含一个收件人的所有字段
         """
         logger.debug(f"开始刷新表格数据，共 {len(data)} 条记录")
         
-        # 清空现有数据
-        for item in self.recipients_tree.get_children():
-            self.recipients_tree.delete(item)
-        
-        # 添加新数据
-        for recipient in data:
-            values = []
-            for col in self.current_columns:
-                values.append(recipient.get(col, ""))
-            self.recipients_tree.insert("", "end", values=values)
+        # 换成新的数据时回到顶部并清除选中，同一份数据刷新时保持滚动位置
+        if data is not self._rows:
+            self._row_start = 0
+            self.recipients_tree.selection_set([])
+            self._email_to_index = {}
+            self._indexed_rows = 0
+        self._rows = data
+        # 只为新增的行建立邮箱索引，导入过程中数据会不断追加
+        for index in range(self._indexed_rows, len(data)):
+            self._email_to_index.setdefault(data[index].get('email', ''), index)
+        self._indexed_rows = len(data)
+        self._render_window(self._row_start)
         
         logger.debug("表格数据刷新完成")
 
+    def _render_window(self, start: int) -> None:
+        """
+        渲染从指定数据索引开始的可见窗口
+        
+        复用已有的表格行，只在可见行数变化时增删行。
+        
+        Args:
+            start: 可见窗口第一行对应的数据索引
+        """
+        tree = self.recipients_tree
+        total = len(self._rows)
+        start = max(0, min(start, total - self._page_size))
+        
+        # 记录选中行对应的数据索引，窗口移动后恢复选中
+        selected = [self._row_index_of(iid) for iid in tree.selection()]
+        self._row_start = start
+        
+        # 调整行池大小
+        count = min(self._page_size, total - start)
+        if len(self._slot_iids) < count:
+            new_iids = self.tk.call("apply", _TCL_INSERT_ROWS, str(tree), len(self._slot_iids), count)
+            self._slot_iids.extend(self.tk.splitlist(new_iids))
+        if len(self._slot_iids) > count:
+            tree.delete(*self._slot_iids[count:])
+            del self._slot_iids[count:]
+        
+        # 批量更新可见行的数据
+        if count:
+            columns = self.current_columns
+            visible = self._rows[start:start + count]
+            rows = tuple(tuple(recipient.get(col, "") for col in columns) for recipient in visible)
+            tags = tuple(self.STATUS_TAGS.get(recipient.get(self.STATUS_COLUMN['id']), "")
+                         for recipient in visible)
+            self.tk.call("apply", _TCL_SET_ROW_VALUES, str(tree), tuple(self._slot_iids), rows, tags)
+        
+        tree.selection_set([self._slot_iids[i - start] for i in selected if start <= i < start + count])
+        self._update_scrollbar()
+
+    def _reindex_email(self, index: int, old_email: str, new_email: str) -> None:
+        """
+        在某行的邮箱被修改后更新邮箱索引
+        
+        Args:
+            index: 被修改行的数据索引
+            old_email: 修改前的邮箱
+            new_email: 修改后的邮箱
+        """
+        if old_email == new_email:
+            return
+        if self._email_to_index.get(old_email) == index:
+            del self._email_to_index[old_email]
+        # 邮箱重复时索引指向第一条
+        existing = self._email_to_index.get(new_email)
+        if existing is None or index < existing:
+            self._email_to_index[new_email] = index
+
+    def _row_index_of(self, iid: str) -> int:
+        """
+        获取表格行当前显示的数据索引
+        
+        表格行ID为 slot<序号>，序号即该行在可见窗口中的位置，无需查询表格。
+        
+        Args:
+            iid: 表格行ID
+            
+        Returns:
+            int: 数据索引
+        """
+        return self._row_start + int(iid[len(_SLOT_PREFIX):])
+
+    def _slot_of(self, index: int) -> Optional[str]:
+        """
+        获取显示指定数据行的表格行ID
+        
+        Args:
+            index: 数据索引
+            
+        Returns:
+            Optional[str]: 表格行ID，该行不在可见窗口内时返回None
+        """
+        offset = index - self._row_start
+        if 0 <= offset < len(self._slot_iids):
+            return self._slot_iids[offset]
+        return None
+
+    def _schedule_render(self) -> None:
+        """在空闲时重新测量可见行数并渲染，合并短时间内的多次请求"""
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._flush_render)
+
+    def _flush_render(self) -> None:
+        """执行已计划的渲染"""
+        self._render_pending = False
+        if not self.recipients_tree.winfo_exists():
+            return
+        self._page_size = self._measure_page_size()
+        self._render_window(self._row_start)
+
+    def _measure_page_size(self) -> int:
+        """
+        计算表格可见区域能容纳的行数
+        
+        Returns:
+            int: 可见行数，至少为1
+        """
+        bbox = self.recipients_tree.bbox(self._slot_iids[0]) if self._slot_iids else ""
+        if bbox:
+            _, top, _, row_height = bbox
+        else:
+            top, row_height = self.DEFAULT_HEADING_HEIGHT, self.DEFAULT_ROW_HEIGHT
+        return max(1, (self.recipients_tree.winfo_height() - top) // max(1, row_height))
+
+    def _scroll_to(self, start: int) -> None:
+        """
+        滚动到指定的数据索引
+        
+        Args:
+            start: 新的可见窗口起始索引
+        """
+        start = max(0, min(start, len(self._rows) - self._page_size))
+        if start != self._row_start:
+            self._render_window(start)
+
+    def _update_scrollbar(self) -> None:
+        """根据可见窗口在全部数据中的位置更新滚动条"""
+        total = len(self._rows)
+        if total <= self._page_size:
+            position = (0.0, 1.0)
+        else:
+            position = (self._row_start / total,
+                        min(1.0, (self._row_start + self._page_size) / total))
+        # 位置未变化时不重复设置，避免多余的滚动条重绘
+        if position != self._scrollbar_position:
+            self._scrollbar_position = position
+            self.scrollbar.set(*position)
+
+    def _on_scrollbar(self, *args) -> None:
+        """
+        处理滚动条操作
+        
+        Args:
+            args: 滚动条命令参数，("moveto", 比例) 或 ("scroll", 数量, "units"/"pages")
+        """
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._rows)))
+        elif args[0] == "scroll":
+            step = self._page_size if args[2] == "pages" else 1
+            self._scroll_to(self._row_start + int(args[1]) * step)
+
+    def _on_mouse_wheel(self, event) -> str:
+        """
+        处理鼠标滚轮事件
+        
+        Args:
+            event: 滚轮事件对象，Linux下为Button-4/5事件
+            
+        Returns:
+            str: "break"，阻止表格自身的滚动处理
+        """
+        if event.num == 4 or event.delta > 0:
+            direction = -1
+        else:
+            direction = 1
+        self._scroll_to(self._row_start + direction * self.WHEEL_STEP)
+        return "break"
+
+    def _on_arrow_key(self, direction: int) -> Optional[str]:
+        """
+        处理上下方向键，在可见窗口边缘时滚动数据
+        
+        Args:
+            direction: 方向，-1 向上，1 向下
+            
+        Returns:
+            Optional[str]: 已处理时返回 "break"，否则交由表格默认处理
+        """
+        tree = self.recipients_tree
+        focus = tree.focus()
+        if not focus:
+            return None
+        edge = 0 if direction < 0 else len(self._slot_iids) - 1
+        if self._row_index_of(focus) - self._row_start != edge:
+            return None
+        self._scroll_to(self._row_start + direction)
+        if edge < len(self._slot_iids):
+            iid = self._slot_iids[edge]
+            tree.selection_set(iid)
+            tree.focus(iid)
+        return "break"
+
+    def _on_page_key(self, direction: int) -> str:
+        """
+        处理 PageUp/PageDown 键，将焦点按页在全部数据中移动
+        
+        Args:
+            direction: 方向，-1 向上，1 向下
+            
+        Returns:
+            str: "break"，阻止表格只在可见窗口内移动
+        """
+        focus = self.recipients_tree.focus()
+        current = self._row_index_of(focus) if focus else self._row_start
+        return self._focus_row(current + direction * self._page_size)
+
+    def _focus_row(self, index: int) -> str:
+        """
+        选中并聚焦指定的数据行，必要时滚动使其可见
+        
+        Args:
+            index: 数据索引，超出范围时取最近的有效行
+            
+        Returns:
+            str: "break"，阻止表格自身的按键处理
+        """
+        if not self._rows:
+            return "break"
+        index = max(0, min(index, len(self._rows) - 1))
+        if index < self._row_start:
+            self._scroll_to(index)
+        elif index >= self._row_start + len(self._slot_iids):
+            self._scroll_to(index - self._page_size + 1)
+        iid = self._slot_of(index)
+        if iid is not None:
+            self.recipients_tree.selection_set(iid)
+            self.recipients_tree.focus(iid)
+        return "break"
+
     def on_double_click(self, event):
         """
         处理双击编辑事件
@@ -218,18 +540,23 @@ class RecipientsPanel(ttk.LabelFrame):
         - 验证输入数据
         - 保存修改结果
         
+        后台导入进行中时不打开编辑窗口。
+        
         Args:
             event: 鼠标双击事件对象
         """
+        if self._importing:
+            # 导入完成前服务中仍是原有数据，表格的行索引与之不对应，不允许编辑
+            logger.debug("正在导入CSV文件，忽略编辑请求")
+            return "break"
         try:
             # 确保有选中的项
-            selection = self.recipients_tree.selection()
-            if not selection:
+            item = self.recipients_tree.focus()
+            if not item:
                 logger.debug("未选中任何项，忽略双击事件")
                 return
                 
-            item = selection[0]
-            row_index = self.recipients_tree.index(item)
+            row_index = self._row_index_of(item)
             recipient = self.service.get_recipient(row_index)
             
             logger.info(f"开始编辑收件人信息: {recipient.get('email', 'N/A')}")
@@ -256,10 +583,11 @@ class RecipientsPanel(ttk.LabelFrame):
         """
         logger.debug("创建编辑窗口")
         
+        # 先隐藏窗口，所有控件创建完成并设置好位置后再显示
         edit_window = tk.Toplevel(self)
+        edit_window.withdraw()
         edit_window.title("编辑收件人信息")
         edit_window.transient(self)
-        edit_window.grab_set()
         
         # 创建主框架
         main_frame = ttk.Frame(edit_window, padding="10")
@@ -278,8 +606,10 @@ class RecipientsPanel(ttk.LabelFrame):
         # 创建按钮
         self._create_edit_buttons(main_frame, edit_window, entries, recipient, item, row_index)
         
-        # 设置窗口大小和位置
+        # 设置窗口大小和位置并显示
         self._setup_window_geometry(edit_window, main_frame)
+        edit_window.deiconify()
+        edit_window.grab_set()
         
         logger.debug("编辑窗口创建完成")
         return edit_window
@@ -296,7 +626,8 @@ class RecipientsPanel(ttk.LabelFrame):
         """
         导入CSV文件
         
-        打开文件选择对话框，导入并验证CSV文件数据，然后更新显示。
+        打开文件选择对话框，在后台线程中解析CSV文件，
+        解析过程中定时把已读取的行显示到表格中，完成后验证并更新显示。
         包括：
         - 验证必需字段
         - 检查模板参数
@@ -308,11 +639,51 @@ class RecipientsPanel(ttk.LabelFrame):
         if not file_path:
             logger.debug("用户取消了文件选择")
             return
-            
-        # 使用服务导入CSV
-        success, error_msg, data = self.service.import_csv(file_path)
         
+        # 使用服务导入CSV，解析出的行逐条追加到 rows 中
+        rows: List[Dict[str, str]] = []
+        future = self._io_pool.submit(self.service.import_csv, file_path, rows)
+        self.import_btn.configure(state="disabled")
+        self._importing = True
+        self._show_status("正在导入...", transient=False)
+        self.refresh_treeview(rows)
+        self.after(self.IMPORT_POLL_MS, self._poll_import, future, rows)
+
+    def _poll_import(self, future: Future, rows: List[Dict[str, str]]) -> None:
+        """
+        检查后台导入进度
+        
+        导入未完成时显示新解析的行并继续等待，完成后处理导入结果。
+        Tk 不能在工作线程中调用，因此在主线程中定时轮询，而不是使用完成回调。
+        
+        Args:
+            future: 导入任务
+            rows: 导入任务正在填充的数据列表
+        """
+        if not future.done():
+            if self._rows is rows and len(rows) != self._indexed_rows:
+                self.refresh_treeview(rows)
+                self._show_status(f"正在导入... 已读取 {len(rows)} 条", transient=False)
+            self.after(self.IMPORT_POLL_MS, self._poll_import, future, rows)
+            return
+        
+        self.import_btn.configure(state="normal")
+        self._importing = False
+        self._show_status("")
+        self._finish_import(*future.result())
+
+    def _finish_import(self, success: bool, error_msg: str, data: List[Dict[str, str]]) -> None:
+        """
+        处理导入结果
+        
+        Args:
+            success: 是否导入成功
+            error_msg: 错误信息
+            data: 导入的数据
+        """
         if not success:
+            # 恢复显示原有数据
+            self.refresh_treeview(self.service.get_recipients())
             logger.error(f"CSV导入失败: {error_msg}")
             messagebox.showerror("错误", error_msg)
             if self.on_import:
@@ -335,15 +706,32 @@ class RecipientsPanel(ttk.LabelFrame):
         custom_params = ParameterService.get_custom_param_identifiers()
         param_columns = ParameterService.get_display_columns(custom_params)
         self.current_columns = param_columns + [self.STATUS_COLUMN['id']]
+        self._refresh_display_names()
+        self._apply_columns()
         self.refresh_treeview(data)
         
         logger.info(f"成功导入 {len(data)} 条收件人信息")
-        messagebox.showinfo("成功", f"已导入 {len(data)} 条收件人信息")
+        self._show_status(f"已导入 {len(data)} 条收件人信息")
         
         # 调用导入成功回调
         if self.on_import:
             self.on_import(True)
 
+    def _show_status(self, text: str, transient: bool = True) -> None:
+        """
+        在状态栏显示提示信息
+        
+        Args:
+            text: 提示信息
+            transient: 是否在一段时间后自动清除
+        """
+        if self._status_clear_id is not None:
+            self.after_cancel(self._status_clear_id)
+            self._status_clear_id = None
+        self.status_label.configure(text=text)
+        if transient and text:
+            self._status_clear_id = self.after(self.STATUS_MESSAGE_MS, self._show_status, "")
+
     def save_csv(self):
         """
         保存CSV文件
@@ -369,7 +757,7 @@ class RecipientsPanel(ttk.LabelFrame):
         
         if success:
             logger.info("CSV文件保存成功")
-            messagebox.showinfo("成功", "数据已保存")
+            self._show_status("数据已保存")
         else:
             logger.error(f"CSV保存失败: {error_msg}")
             messagebox.showerror("错误", error_msg)
@@ -378,22 +766,47 @@ class RecipientsPanel(ttk.LabelFrame):
         """
         更新指定收件人的发送状态
         
+        邮箱重复时更新第一条，与按邮箱查找的规则一致。
+        
         Args:
             email: 收件人邮箱
             status: 新的发送状态
         """
-        logger.debug(f"更新发送状态 - 邮箱: {email}, 状态: {status}")
+        logger.debug("更新发送状态 - 邮箱: %s, 状态: %s", email, status)
+        index = self._email_to_index.get(email)
+        if index is None:
+            logger.warning(f"未找到收件人: {email}")
+            return
+        self.update_status_by_index(index, status)
+
+    def update_status_by_index(self, index: int, status: str):
+        """
+        按数据索引更新收件人的发送状态
         
-        if self.service.update_status(email, status):
-            # 更新显示
-            for item in self.recipients_tree.get_children():
-                if self.recipients_tree.item(item)['values'][0] == email:
-                    values = list(self.recipients_tree.item(item)['values'])
-                    status_index = self.current_columns.index('status')
-                    values[status_index] = status
-                    self.recipients_tree.item(item, values=values)
-                    logger.debug("状态更新成功")
-                    break
+        数据立即更新，表格显示在空闲时统一刷新，同一轮事件中的多次更新只重绘一次。
+        
+        Args:
+            index: 收件人数据索引
+            status: 新的发送状态
+        """
+        if self.service.update_status_by_index(index, status):
+            self._pending_status[index] = status
+            if not self._status_flush_scheduled:
+                self._status_flush_scheduled = True
+                self.after_idle(self._flush_status)
+
+    def _flush_status(self) -> None:
+        """将等待中的状态更新写入表格"""
+        self._status_flush_scheduled = False
+        pending, self._pending_status = self._pending_status, {}
+        for index, status in pending.items():
+            # 只有在可见窗口内的行需要更新显示，其余行在滚动到时从数据中渲染
+            iid = self._slot_of(index)
+            if iid:
+                self.recipients_tree.set(iid, self.STATUS_COLUMN['id'], status)
+                tag = self.STATUS_TAGS.get(status)
+                self.recipients_tree.item(iid, tags=(tag,) if tag else ())
+        logger.debug(f"刷新了 {len(pending)} 条状态更新")
 
     def get_recipients(self) -> List[Dict[str, str]]:
         """
@@ -404,6 +817,27 @@ class RecipientsPanel(ttk.LabelFrame):
         """
         return self.service.get_recipients()
 
+    def get_recipient_count(self) -> int:
+        """
+        获取收件人数量
+        
+        Returns:
+            int: 收件人数量
+        """
+        return self.service.get_recipient_count()
+
+    def get_recipient(self, index: int) -> Dict[str, str]:
+        """
+        获取指定索引的收件人
+        
+        Args:
+            index: 收件人数据索引
+            
+        Returns:
+            Dict[str, str]: 收件人数据
+        """
+        return self.service.get_recipient(index)
+
     def clear_recipients(self):
         """
         清空收件人列表
@@ -423,7 +857,7 @@ class RecipientsPanel(ttk.LabelFrame):
                 self.on_import(False)
             # 刷新显示
             self.refresh_treeview([])
-            messagebox.showinfo("成功", "收件人列表已清空")
+            self._show_status("收件人列表已清空")
             logger.info("收件人列表已清空")
 
     def _setup_scrollable_frame(self, container: ttk.Frame) -> Tuple[tk.Canvas, ttk.Scrollbar, ttk.Frame]:
@@ -461,51 +895,43 @@ class RecipientsPanel(ttk.LabelFrame):
         logger.debug("可滚动框架创建完成")
         return canvas, scrollbar, scrollable_frame
 
-    def _create_input_fields(self, parent: ttk.Frame, recipient: Dict[str, str]) -> Dict[str, ttk.Entry]:
+    def _create_input_fields(self, parent: ttk.Frame,
+                             recipient: Dict[str, str]) -> Dict[str, Tuple[ttk.Entry, tk.StringVar]]:
         """
         创建输入字段
         
+        每个输入框绑定一个以初始值创建的 StringVar，读取输入时直接使用变量的值。
+        
         Args:
             parent: 父级框架
             recipient: 收件人数据
             
         Returns:
-            Dict[str, ttk.Entry]: 字段名到输入框的映射
+            Dict[str, Tuple[ttk.Entry, tk.StringVar]]: 字段名到 (输入框, 输入变量) 的映射
         """
         logger.debug("创建输入字段")
         
         entries = {}
         
-        # 计算标签最大宽度
-        max_label_width = 0
-        display_names = []
-        for col in self.current_columns:
-            if col != self.STATUS_COLUMN['id']:
-                display_name = ParameterService.get_column_display_name(col)
-                display_names.append((col, display_name))
-                width = len(display_name) * 2  # 估算中文字符宽度
-                max_label_width = max(max_label_width, width)
-        
         # 添加参数输入框
-        for col, display_name in display_names:
+        for col, display_name in self._display_fields:
             frame = ttk.Frame(parent)
             frame.pack(fill="x", pady=2)  # 将 pady 从5修改为2
             
-            label = ttk.Label(frame, text=f"{display_name}:", width=max_label_width)
+            label = ttk.Label(frame, text=f"{display_name}:", width=self._max_label_width)
             label.pack(side="left", padx=(5, 10))
             
-            entry = ttk.Entry(frame)
-            entry.insert(0, recipient.get(col, ""))
+            var = tk.StringVar(frame, value=recipient.get(col, ""))
+            entry = ttk.Entry(frame, textvariable=var, width=40)
             entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
-            entry.configure(width=40)
             
-            entries[col] = entry
+            entries[col] = (entry, var)
         
         logger.debug(f"创建了 {len(entries)} 个输入字段")
         return entries
 
     def _create_edit_buttons(self, parent: ttk.Frame, window: tk.Toplevel, 
-                           entries: Dict[str, ttk.Entry], recipient: Dict[str, str],
+                           entries: Dict[str, Tuple[ttk.Entry, tk.StringVar]], recipient: Dict[str, str],
                            item: str, row_index: int):
         """
         创建编辑窗口的按钮
@@ -513,7 +939,7 @@ class RecipientsPanel(ttk.LabelFrame):
         Args:
             parent: 父级框架
             window: 编辑窗口
-            entries: 输入框字典
+            entries: 字段名到 (输入框, 输入变量) 的映射
             recipient: 收件人数据
             item: 树形视图项ID
             row_index: 行索引
@@ -522,9 +948,9 @@ class RecipientsPanel(ttk.LabelFrame):
 
         def validate_input() -> bool:
             """验证输入数据"""
-            for col, entry in entries.items():
-                value = entry.get().strip()
-                display_name = ParameterService.get_column_display_name(col)
+            for col, (entry, var) in entries.items():
+                value = var.get().strip()
+                display_name = self._display_names[col]
                 
                 # 检查必填字段
                 if col in ['email', 'name'] and not value:
@@ -535,7 +961,7 @@ class RecipientsPanel(ttk.LabelFrame):
                     return False
 
                 # 验证邮箱格式
-                if col == 'email' and '@' not in value:
+                if col == 'email' and not _EMAIL_RE.match(value):
                     error_msg = "请输入有效的邮箱地址"
                     logger.warning(f"输入验证失败: {error_msg}")
                     messagebox.showerror("错误", error_msg)
@@ -558,15 +984,18 @@ class RecipientsPanel(ttk.LabelFrame):
                     if col == self.STATUS_COLUMN['id']:
                         new_values.append(recipient[col])
                     else:
-                        value = entries[col].get().strip()
+                        value = entries[col][1].get().strip()
                         new_data[col] = value
                         new_values.append(value)
 
                 # 使用服务更新数据
                 self.service.update_recipient(row_index, new_data)
+                self._reindex_email(row_index, recipient.get('email', ''), new_data.get('email', ''))
 
-                # 更新treeview
-                self.recipients_tree.item(item, values=new_values)
+                # 更新显示该行的表格项，编辑期间可见窗口可能已移动
+                iid = self._slot_of(row_index)
+                if iid:
+                    self.recipients_tree.item(iid, values=new_values)
                 logger.info("编辑内容保存成功")
                 window.destroy()
 
@@ -597,6 +1026,8 @@ class RecipientsPanel(ttk.LabelFrame):
         """
         设置窗口大小和位置
         
+        在窗口内容全部创建完成后调用，只计算一次布局。
+        
         Args:
             window: 目标窗口
             content_frame: 内容框架
@@ -608,7 +1039,7 @@ class RecipientsPanel(ttk.LabelFrame):
         # 计算合适的窗口大小
         frame_width = max(500, content_frame.winfo_reqwidth() + 40)  # 设置最小宽度为500
         frame_height = min(content_frame.winfo_reqheight() + 60,
-                         window.winfo_screenheight() * 0.8)
+                         int(window.winfo_screenheight() * 0.8))
         
         # 设置窗口大小和位置
         screen_width = window.winfo_screenwidth()
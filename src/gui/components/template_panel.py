@@ -5,10 +5,12 @@
 支持HTML/纯文本格式切换、富文本编辑、字体设置等功能。
 """
 
+import itertools
 import tkinter as tk
 from tkinter import ttk
+from tkinter.font import Font
 from src.utils.font_manager import FontManager
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List, Tuple
 from src.utils.logger import setup_logger
 from src.services.template_service import TemplateService
 
@@ -30,8 +32,15 @@ class TemplatePanel(ttk.LabelFrame):
         subject: 主题输入框
         content: 正文编辑区
         mail_format: 邮件格式选择
+        NOTIFY_DELAY_MS: 输入停顿多久后才同步模板（毫秒）
+        MAX_UNDO: 正文编辑区保留的最大撤销步数
     """
     
+    # 连续输入时合并为一次同步
+    NOTIFY_DELAY_MS = 200
+    # 撤销记录的最大步数，避免长时间编辑后撤销栈无限增长
+    MAX_UNDO = 200
+    
     def __init__(self, parent, template_service: TemplateService):
         """
         初始化模板编辑面板
@@ -46,6 +55,9 @@ class TemplatePanel(ttk.LabelFrame):
         self.template_service = template_service
         self.font_manager = FontManager()
         self.on_content_change: Optional[Callable[[], None]] = None
+        self._pending_notify: Optional[str] = None  # 待执行的内容变更通知
+        self._tag_fonts: Dict[str, Font] = {}  # 各标签当前配置的字体
+        self._last_format: Optional[str] = None  # 最近一次处理过的邮件格式
         self._init_ui()
         
         # 从模板服务加载初始数据
@@ -99,7 +111,7 @@ class TemplatePanel(ttk.LabelFrame):
                        value="plain", command=self._on_format_change).pack(side="right", padx=5)
         
         # 内容编辑区
-        self.content = tk.Text(self, height=10, undo=True)
+        self.content = tk.Text(self, height=10, undo=True, maxundo=self.MAX_UNDO)
         self.content.pack(fill="both", expand=True, padx=5, pady=5)
         
         # 绑定字体更改事件
@@ -109,128 +121,105 @@ class TemplatePanel(ttk.LabelFrame):
         # 设置默认字体
         self.content.configure(font=self.font_manager.current_font)
         
+        # 格式标签的字体只配置一次，之后切换格式只需添加或移除标签
+        current_font = self.font_manager.current_font
+        family, size = current_font.cget("family"), current_font.cget("size")
+        self._configure_tag_font("bold", self.font_manager.create_font(
+            family=family, size=size, weight="bold"))
+        self._configure_tag_font("italic", self.font_manager.create_font(
+            family=family, size=size, slant="italic"))
+        self._configure_tag_font("underline", self.font_manager.create_font(underline=True))
+        
         # 绑定内容变更事件
-        self.subject.bind('<KeyRelease>', lambda e: self._notify_content_change())
-        self.content.bind('<KeyRelease>', lambda e: self._notify_content_change())
+        self.subject.bind('<KeyRelease>', lambda e: self._schedule_notify())
+        self.content.bind('<KeyRelease>', lambda e: self._schedule_notify())
         
         logger.debug("用户界面初始化完成")
 
     def toggle_bold(self):
         """切换选中文本的加粗状态"""
-        try:
-            current_tags = self.content.tag_names("sel.first")
-            if "bold" in current_tags:
-                logger.debug("移除加粗格式")
-                self.content.tag_remove("bold", "sel.first", "sel.last")
-            else:
-                logger.debug("添加加粗格式")
-                self.content.tag_add("bold", "sel.first", "sel.last")
-                # 创建加粗字体并应用
-                current_font = self.content.cget("font")
-                if isinstance(current_font, str):
-                    current_font = self.font_manager.current_font
-                bold_font = self.font_manager.create_font(
-                    family=current_font.cget("family"),
-                    size=current_font.cget("size"),
-                    weight="bold"
-                )
-                self.content.tag_configure("bold", font=bold_font)
-            self._notify_content_change()
-        except tk.TclError:
-            logger.debug("未选中文本，忽略加粗操作")
-            pass
+        self._toggle_selection_tag("bold", "加粗")
 
     def toggle_italic(self):
         """切换选中文本的斜体状态"""
-        try:
-            current_tags = self.content.tag_names("sel.first")
-            if "italic" in current_tags:
-                logger.debug("移除斜体格式")
-                self.content.tag_remove("italic", "sel.first", "sel.last")
-            else:
-                logger.debug("添加斜体格式")
-                self.content.tag_add("italic", "sel.first", "sel.last")
-                # 创建斜体字体并应用
-                current_font = self.content.cget("font")
-                if isinstance(current_font, str):
-                    current_font = self.font_manager.current_font
-                italic_font = self.font_manager.create_font(
-                    family=current_font.cget("family"),
-                    size=current_font.cget("size"),
-                    slant="italic"
-                )
-                self.content.tag_configure("italic", font=italic_font)
-            self._notify_content_change()
-        except tk.TclError:
-            logger.debug("未选中文本，忽略斜体操作")
-            pass
+        self._toggle_selection_tag("italic", "斜体")
 
     def toggle_underline(self):
         """切换选中文本的下划线状态"""
-        try:
-            current_tags = self.content.tag_names("sel.first")
-            if "underline" in current_tags:
-                logger.debug("移除下划线格式")
-                self.content.tag_remove("underline", "sel.first", "sel.last")
-            else:
-                logger.debug("添加下划线格式")
-                self.content.tag_add("underline", "sel.first", "sel.last")
-                underline_font = self.font_manager.create_font(underline=True)
-                self.content.tag_configure("underline", font=underline_font)
-            self._notify_content_change()
-        except tk.TclError:
-            logger.debug("未选中文本，忽略下划线操作")
-            pass
+        self._toggle_selection_tag("underline", "下划线")
+
+    def _toggle_selection_tag(self, tag: str, label: str):
+        """
+        切换选中文本的格式标签
+        
+        以选区第一个字符是否带有该标签为准，带有则移除，否则添加。
+        
+        Args:
+            tag: 格式标签名称
+            label: 日志中使用的格式名称
+        """
+        selection = self.content.tag_ranges("sel")
+        if not selection:
+            logger.debug("未选中文本，忽略%s操作", label)
+            return
+        start, end = selection[0], selection[-1]
+        if tag in self.content.tag_names(start):
+            logger.debug("移除%s格式", label)
+            self.content.tag_remove(tag, start, end)
+        else:
+            logger.debug("添加%s格式", label)
+            self.content.tag_add(tag, start, end)
+        self._notify_content_change()
 
     def apply_font(self, event=None):
         """
         应用字体到选中的文本
         
+        有选中文本时只应用到选中部分，否则应用到整个文本框。
+        
         Args:
             event: 事件对象（可选）
         """
         try:
+            new_font = self.font_manager.create_font(
+                family=self.font_family.get(),
+                size=int(self.font_size.get())
+            )
             # 获取选中的文本范围
-            try:
-                selected_range = self.content.tag_ranges("sel")
-                if selected_range:
-                    # 如果有选中文本，只应用到选中部分
-                    tag_name = f"font_{self.font_family.get()}_{self.font_size.get()}"
-                    self.content.tag_add(tag_name, "sel.first", "sel.last")
-                    new_font = self.font_manager.create_font(
-                        family=self.font_family.get(),
-                        size=int(self.font_size.get())
-                    )
-                    self.content.tag_configure(tag_name, font=new_font)
-                else:
-                    # 如果没有选中文本，应用到整个文本框
-                    new_font = self.font_manager.create_font(
-                        family=self.font_family.get(),
-                        size=int(self.font_size.get())
-                    )
-                    self.content.configure(font=new_font)
-            except tk.TclError:
-                # 如果没有选中文本，应用到整个文本框
-                new_font = self.font_manager.create_font(
-                    family=self.font_family.get(),
-                    size=int(self.font_size.get())
-                )
+            selection = self.content.tag_ranges("sel")
+            if selection:
+                tag_name = f"font_{self.font_family.get()}_{self.font_size.get()}"
+                self.content.tag_add(tag_name, selection[0], selection[-1])
+                self._configure_tag_font(tag_name, new_font)
+            else:
                 self.content.configure(font=new_font)
                 
-            logger.debug(f"应用字体 - 字体: {self.font_family.get()}, 字号: {self.font_size.get()}")
+            logger.debug("应用字体 - 字体: %s, 字号: %s", self.font_family.get(), self.font_size.get())
             self._notify_content_change()
             
         except Exception as e:
             error_msg = f"设置字体失败: {str(e)}"
             logger.error(error_msg, exc_info=True)
 
+    def _configure_tag_font(self, tag: str, font: Font):
+        """
+        为标签设置字体，字体未变化时不重复配置
+        
+        Args:
+            tag: 标签名称
+            font: 字体对象
+        """
+        if self._tag_fonts.get(tag) is not font:
+            self.content.tag_configure(tag, font=font)
+            self._tag_fonts[tag] = font
+
     def get_template_config(self) -> Dict[str, Any]:
         """
         获取当前模板配置
 
         提取文本内容和格式标签，将 Tkinter 富文本转换为适合 HTML 渲染的格式。
-        该方法通过逐字符遍历文本内容，从而精确记录各个字符的位置所对应的格式标签，
-        确保在标签范围、标签合并与换行符处理上与实际设置保持一致。
+        每个标签只查询一次其覆盖的区间，再将区间换算为绝对字符位置，
+        每个字符上的标签按标签优先级排列，与逐字符查询 tag_names 的结果一致。
 
         Returns:
             Dict[str, Any]: 包含模板配置的字典，其中包括:
@@ -245,15 +234,22 @@ class TemplatePanel(ttk.LabelFrame):
 
         # 获取所有文本内容
         content = self.content.get("1.0", "end-1c")
-        tags = {}
+        tags: Dict[int, List[str]] = {}
+
+        # 每行起始字符的绝对位置，用于将 "行.列" 索引换算为绝对位置
+        line_offsets = list(itertools.accumulate(
+            (len(line) + 1 for line in content.split('\n')), initial=0))
+
+        def to_offset(index) -> int:
+            line, column = map(int, str(index).split('.'))
+            return line_offsets[line - 1] + column
 
-        # 遍历文本中每个字符的位置，并记录每个字符的激活标签
-        for i in range(len(content)):
-            # 将绝对位置 i 转换为 Tkinter 索引（例如："1.0+{i}c"）
-            tk_index = self.content.index(f"1.0+{i}c")
-            current_tags = self.content.tag_names(tk_index)
-            if current_tags:
-                tags[str(i)] = list(current_tags)
+        # 按优先级遍历所有标签，记录每个标签覆盖的字符
+        for tag in self.content.tag_names():
+            ranges = self.content.tag_ranges(tag)
+            for start, end in zip(ranges[0::2], ranges[1::2]):
+                for i in range(to_offset(start), min(to_offset(end), len(content))):
+                    tags.setdefault(i, []).append(tag)
 
         return {
             "subject": self.subject.get(),
@@ -282,7 +278,8 @@ class TemplatePanel(ttk.LabelFrame):
         self.subject.delete(0, tk.END)
         self.subject.insert(0, template_data['subject'])
         
-        # 设置内容
+        # 设置内容，加载过程不记录撤销步骤
+        self.content.configure(autoseparators=False)
         self.content.delete("1.0", tk.END)
         self.content.insert("1.0", template_data['content'])
         
@@ -293,25 +290,101 @@ class TemplatePanel(ttk.LabelFrame):
         self.font_family.set(template_data['font_family'])
         self.font_size.set(template_data['font_size'])
         
-        # 应用格式标签
-        for pos, tags in template_data['tags'].items():
-            for tag in tags:
+        # 工具栏状态与加载的格式保持一致
+        self._last_format = self.mail_format.get()
+        self._update_format_controls()
+        
+        # 应用格式标签，连续的字符合并为一个区间添加
+        for tag, runs in self._tag_runs(template_data['tags']).items():
+            for start, end in runs:
+                self.content.tag_add(tag, f"1.0+{start}c", f"1.0+{end}c")
+        
+        # 加载的内容不可撤销
+        self.content.edit_reset()
+        self.content.configure(autoseparators=True)
+
+    @staticmethod
+    def _tag_runs(tags: Dict[int, List[str]]) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        将按字符位置记录的格式标签合并为连续区间
+        
+        Args:
+            tags: 绝对字符位置到标签列表的映射
+            
+        Returns:
+            Dict[str, List[Tuple[int, int]]]: 标签到 [起始位置, 结束位置) 区间列表的映射
+        """
+        positions: Dict[str, List[int]] = {}
+        for pos, tag_list in tags.items():
+            for tag in tag_list:
                 if tag in ["bold", "italic", "underline"]:
-                    self.content.tag_add(tag, f"1.{pos}")
+                    positions.setdefault(tag, []).append(int(pos))
+        
+        runs: Dict[str, List[Tuple[int, int]]] = {}
+        for tag, tag_positions in positions.items():
+            tag_positions.sort()
+            tag_runs = runs[tag] = []
+            start = end = tag_positions[0]
+            for pos in tag_positions[1:]:
+                if pos != end + 1:
+                    tag_runs.append((start, end + 1))
+                    start = pos
+                end = pos
+            tag_runs.append((start, end + 1))
+        return runs
+
+    def _schedule_notify(self):
+        """
+        延迟通知内容变化
+
+        输入停顿 NOTIFY_DELAY_MS 毫秒后才执行通知，连续按键只触发一次同步。
+        按键只改变文本，通知时按仅文本变化处理。
+        """
+        if self._pending_notify:
+            self.after_cancel(self._pending_notify)
+        self._pending_notify = self.after(
+            self.NOTIFY_DELAY_MS, self._do_notify_content_change, True)
+
+    def flush_pending_changes(self):
+        """
+        立即执行尚未到期的内容变更通知，确保模板服务中的数据为最新
+        
+        延迟的通知都来自按键，同样按仅文本变化处理，没有格式标签时不会重新生成标签。
+        """
+        if self._pending_notify:
+            self.after_cancel(self._pending_notify)
+            self._do_notify_content_change(text_only=True)
 
     def _notify_content_change(self):
-        """通知内容变化"""
+        """立即通知内容变化，并取消尚未执行的延迟通知"""
+        if self._pending_notify:
+            self.after_cancel(self._pending_notify)
+        self._do_notify_content_change()
+
+    def _do_notify_content_change(self, text_only: bool = False):
+        """
+        执行内容变化通知
+        
+        Args:
+            text_only: 是否只有文本发生变化。正文中没有格式标签时，
+                只同步主题和正文文本，不重新生成格式标签
+        """
+        self._pending_notify = None
         try:
             # 更新模板服务中的数据
-            template_config = self.get_template_config()
-            self.template_service.update_template(
-                subject=template_config['subject'],
-                content=template_config['content'],
-                is_html=template_config['is_html'],
-                tags=template_config['tags'],
-                font_family=template_config['font_family'],
-                font_size=template_config['font_size']
-            )
+            if text_only and not self._has_format_tags():
+                self.template_service.update_text(
+                    self.subject.get(), self.content.get("1.0", "end-1c"))
+            else:
+                template_config = self.get_template_config()
+                self.template_service.update_template(
+                    subject=template_config['subject'],
+                    content=template_config['content'],
+                    is_html=template_config['is_html'],
+                    tags=template_config['tags'],
+                    font_family=template_config['font_family'],
+                    font_size=template_config['font_size']
+                )
             
             # 调用回调函数
             if self.on_content_change:
@@ -321,14 +394,38 @@ class TemplatePanel(ttk.LabelFrame):
             error_msg = f"通知内容变化时出错: {str(e)}"
             logger.error(error_msg, exc_info=True)
 
+    def _has_format_tags(self) -> bool:
+        """
+        检查正文中是否有文本带有格式标签
+        
+        输入文本会移动格式标签的位置，只有没有格式标签时才能跳过标签的重新生成。
+        
+        Returns:
+            bool: 是否存在格式标签
+        """
+        return any(self.content.tag_ranges(tag)
+                   for tag in self.content.tag_names() if tag != "sel")
+
     def _on_format_change(self):
-        """处理邮件格式变更事件"""
+        """
+        处理邮件格式变更事件
+        
+        单选按钮回调在格式未实际变化时也可能触发，此时不做任何处理。
+        """
+        mail_format = self.mail_format.get()
+        if mail_format == self._last_format:
+            return
+        self._last_format = mail_format
+        self._update_format_controls()
+        # 通知内容变更
+        self._notify_content_change()
+
+    def _update_format_controls(self):
+        """根据当前邮件格式启用或禁用富文本工具栏"""
         is_html = self.mail_format.get() == "html"
         # 更新按钮状态
         self.bold_btn.configure(state="normal" if is_html else "disabled")
         self.italic_btn.configure(state="normal" if is_html else "disabled")
         self.underline_btn.configure(state="normal" if is_html else "disabled")
         self.font_family.configure(state="normal" if is_html else "disabled")
-        self.font_size.configure(state="normal" if is_html else "disabled")
-        # 通知内容变更
-        self._notify_content_change() 
\ No newline at end of file
+        self.font_size.configure(state="normal" if is_html else "disabled") 
\ No newline at end of file
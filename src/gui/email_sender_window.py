@@ -6,7 +6,10 @@
 邮件发送流程的控制。
 """
 
+import queue
+import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 from src.gui.components.parameter_panel import ParameterPanel
 from src.gui.components.server_panel import ServerPanel
@@ -15,7 +18,7 @@ from src.gui.components.recipients_panel import RecipientsPanel
 from src.services.email_service import EmailService
 from src.services.template_service import TemplateService
 from src.services.parameter_service import ParameterService
-from typing import List, Set, Dict
+from typing import Iterator, List, Set, Dict, Optional, Tuple
 from src.utils.logger import setup_logger
 from src.gui.components.preview_window import PreviewWindow
 
@@ -34,8 +37,15 @@ class EmailSenderWindow:
     
     负责协调各个组件之间的交互，处理用户操作，
     并控制邮件发送流程。
+    
+    Attributes:
+        SEND_POLL_MS: 发送过程中轮询发送队列的间隔（毫秒）
+        SEND_WORKERS: 并行发送使用的SMTP连接数
     """
     
+    SEND_POLL_MS = 50
+    SEND_WORKERS = 4
+    
     def __init__(self):
         """初始化主窗口"""
         logger.info("初始化邮件发送主窗口")
@@ -45,6 +55,12 @@ class EmailSenderWindow:
         # 创建服务实例
         self.template_service = TemplateService()
         
+        # 后台发送线程与主线程之间的通信
+        self._send_queue: queue.Queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._send_thread: Optional[threading.Thread] = None
+        self._send_recipients: List[Dict[str, str]] = []  # 正在发送的收件人快照
+        
         # 获取屏幕尺寸
         screen_width = self.window.winfo_screenwidth()
         screen_height = self.window.winfo_screenheight()
@@ -121,6 +137,11 @@ class EmailSenderWindow:
         self.send_btn = ttk.Button(btn_frame, text="发送邮件", command=self.send_emails)
         self.send_btn.pack(side="left", padx=5)
         
+        # 取消发送按钮
+        self.cancel_btn = ttk.Button(btn_frame, text="取消发送", command=self.cancel_sending,
+                                     state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+        
         # 右侧面板（收件人列表）
         right_frame = ttk.Frame(main_frame)
         right_frame.pack(side="left", fill="both", expand=True, padx=(5,0))
@@ -159,22 +180,10 @@ class EmailSenderWindow:
         """
         处理模板内容变更事件
         
-        当模板内容发生变化时，更新模板服务中的数据。
+        模板面板在内容变化时已更新模板服务中的数据。
         """
         logger.debug("处理模板内容变更事件")
-        
-        # 获取模板面板的当前配置
-        template_config = self.template_panel.get_template_config()
-        
-        # 更新模板服务中的数据
-        self.template_service.update_template(
-            subject=template_config['subject'],
-            content=template_config['content'],
-            is_html=template_config['is_html'],
-            tags=template_config['tags'],
-            font_family=template_config['font_family'],
-            font_size=template_config['font_size']
-        )
+        # 模板面板在回调前已将内容同步到模板服务，这里无需重复读取编辑器内容
 
     def check_template_params(self, available_params: Set[str]):
         """
@@ -185,11 +194,8 @@ class EmailSenderWindow:
         """
         logger.debug("检查模板参数")
         # 获取模板中使用的参数
-        template_config = self.template_panel.get_template_config()
-        template_params = TemplateService.get_template_params(
-            template_config['subject'],
-            template_config['content']
-        )
+        self.template_panel.flush_pending_changes()
+        template_params = self.template_service.get_template_param_set()
 
         # 检查是否有未定义的参数
         undefined_params = template_params - available_params
@@ -209,6 +215,8 @@ class EmailSenderWindow:
             bool: 验证是否通过
         """
         logger.info("开始验证配置和模板")
+        # 同步尚未提交的模板输入
+        self.template_panel.flush_pending_changes()
         # 1. 验证服务器配置
         try:
             server_config = self.server_panel.get_server_config()
@@ -229,14 +237,9 @@ class EmailSenderWindow:
             ParameterService.get_custom_param_identifiers())
             
         # 3. 验证模板参数
-        template_config = self.template_panel.get_template_config()
-        is_valid, undefined_params = TemplateService.validate_template(
-            template_config['subject'],
-            template_config['content'],
-            available_params
-        )
+        undefined_params = self.template_service.get_template_param_set() - available_params
         
-        if not is_valid:
+        if undefined_params:
             error_msg = f"以下参数未定义：\n{', '.join(undefined_params)}\n\n请在参数设置中添加这些参数。"
             logger.error(f"模板参数验证失败: {error_msg}")
             messagebox.showerror("模板参数错误", error_msg)
@@ -255,70 +258,201 @@ class EmailSenderWindow:
         执行邮件发送流程，包括：
         - 验证配置和模板
         - 获取收件人列表
-        - 逐个发送邮件
+        - 在后台线程中通过多个SMTP连接并行发送邮件
         - 更新发送状态
+        
+        发送期间界面保持响应，可以随时取消发送。
         """
         logger.info("开始发送邮件")
+        if self._send_thread is not None and self._send_thread.is_alive():
+            logger.warning("邮件正在发送中")
+            return
+        
         # 首先进行验证
         if not self.validate():
             return
             
-        recipients = self.recipients_panel.get_recipients()
-        if not recipients:
+        count = self.recipients_panel.get_recipient_count()
+        if not count:
             logger.warning("收件人列表为空")
             messagebox.showerror("错误", "请先导入收件人列表")
             return
             
-        try:
-            # 获取服务器配置
-            server_config = self.server_panel.get_server_config()
-            
-            # 获取模板配置
-            template_config = self.template_service.get_template()
-            
-            # 创建邮件服务
-            with EmailService(**server_config) as email_service:
-                for recipient in recipients:
-                    try:
-                        # 更新状态为"发送中"
-                        self.recipients_panel.update_status(recipient['email'], "发送中")
-                        self.window.update()
-                        
-                        # 替换模板变量
-                        subject = TemplateService.replace_variables(template_config['subject'], recipient)
-                        content = TemplateService.replace_variables(template_config['content'], recipient)
-                        
-                        # 如果是HTML格式，转换内容
-                        if template_config['is_html']:
-                            content = TemplateService.replace_variables(self.template_service.get_html_content(), recipient)
-                        
-                        # 发送邮件
-                        logger.debug(f"发送邮件到: {recipient['email']}")
+        # 获取服务器配置
+        server_config = self.server_panel.get_server_config()
+        
+        # 模板按版本缓存解析结果，发送线程只做变量替换
+        is_html = self.template_service.get_template()['is_html']
+        subject_format, content_format = self.template_service.get_compiled_template()
+        has_params = bool(self.template_service.get_template_param_set())
+        
+        # 后台线程发送，状态变化经队列回到主线程更新界面
+        self._cancel_event.clear()
+        self.send_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self._send_recipients = list(self.recipients_panel.get_recipients())
+        self._send_thread = threading.Thread(
+            target=self._send_worker,
+            args=(self._send_recipients, server_config,
+                  subject_format, content_format, is_html, has_params),
+            daemon=True
+        )
+        self._send_thread.start()
+        self.window.after(self.SEND_POLL_MS, self._drain_send_queue)
+
+    def cancel_sending(self):
+        """取消发送，当前正在发送的邮件完成后停止"""
+        logger.info("取消发送邮件")
+        self._cancel_event.set()
+        self.cancel_btn.configure(state="disabled")
+
+    def _send_worker(self, recipients: List[Dict[str, str]], server_config: Dict,
+                     subject_format: str, content_format: str, is_html: bool, has_params: bool):
+        """
+        在后台线程中发送邮件
+        
+        收件人按轮转方式分成 SEND_WORKERS 份，由线程池并行发送，每个线程使用自己的SMTP连接。
+        不直接访问界面，所有状态变化以 (类型, 收件人索引, 内容) 的形式放入发送队列。
+        
+        Args:
+            recipients: 收件人列表的快照，索引与收件人面板一致
+            server_config: 服务器配置
+            subject_format: 主题格式串
+            content_format: 正文格式串（HTML格式时由转换后的HTML生成）
+            is_html: 是否为HTML格式
+            has_params: 模板中是否使用了参数
+        """
+        workers = max(1, min(self.SEND_WORKERS, len(recipients)))
+        logger.debug("使用 %s 个连接并行发送", workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._send_slice, recipients,
+                                range(i, len(recipients), workers), server_config,
+                                subject_format, content_format, is_html, has_params)
+                for i in range(workers)
+            ]
+            errors = []
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    error_msg = f"发送失败: {str(e)}"
+                    logger.error(error_msg, exc_info=True)
+                    errors.append(error_msg)
+        
+        if errors:
+            self._send_queue.put(("error", None, errors[0]))
+        elif self._cancel_event.is_set():
+            logger.info("邮件发送已取消")
+            self._send_queue.put(("cancelled", None, None))
+        else:
+            logger.info("邮件发送完成")
+            self._send_queue.put(("done", None, None))
+
+    def _send_slice(self, recipients: List[Dict[str, str]], indices: range, server_config: Dict,
+                    subject_format: str, content_format: str, is_html: bool, has_params: bool):
+        """
+        使用一个SMTP连接发送一部分收件人的邮件
+        
+        Args:
+            recipients: 收件人列表的快照
+            indices: 本连接负责的收件人索引
+            server_config: 服务器配置
+            subject_format: 主题格式串
+            content_format: 正文格式串
+            is_html: 是否为HTML格式
+            has_params: 模板中是否使用了参数
+        """
+        with EmailService(**server_config) as email_service:
+            payload = None
+            for index, recipient in self._pending_recipients(recipients, indices):
+                try:
+                    if has_params:
+                        # 每个收件人只需一次 format_map 替换变量
                         success = email_service.send_email(
                             to_email=recipient['email'],
-                            subject=subject,
-                            content=content,
-                            is_html=template_config['is_html']
+                            subject=TemplateService.render_format(subject_format, recipient),
+                            content=TemplateService.render_format(content_format, recipient),
+                            is_html=is_html
                         )
-                        
-                        # 更新状态
-                        status = "已发送" if success else "发送失败"
-                        self.recipients_panel.update_status(recipient['email'], status)
-                        
-                    except Exception as e:
-                        error_msg = f"发送给 {recipient['email']} 失败: {str(e)}"
-                        logger.error(error_msg)
-                        self.recipients_panel.update_status(recipient['email'], "发送失败")
-                    
-                    self.window.update()
+                    else:
+                        if payload is None:
+                            # 模板中没有参数时，所有收件人的邮件内容相同，只需构建一次
+                            payload = email_service.prepare_payload(
+                                TemplateService.render_format(subject_format, {}),
+                                TemplateService.render_format(content_format, {}),
+                                is_html)
+                        success = email_service.send_payload(payload, recipient['email'])
+                    status = "已发送" if success else "发送失败"
+                except Exception as e:
+                    # 单个收件人出错时标记为失败，继续发送其余收件人
+                    error_msg = f"发送给 {recipient.get('email', '')} 失败: {str(e)}"
+                    logger.error(error_msg, exc_info=True)
+                    status = "发送失败"
+                
+                # 更新状态
+                self._send_queue.put(("status", index, status))
+
+    def _pending_recipients(self, recipients: List[Dict[str, str]],
+                            indices: range) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        依次取出待发送的收件人，取消发送后停止
+        
+        Args:
+            recipients: 收件人列表的快照
+            indices: 要发送的收件人索引
             
-            logger.info("邮件发送完成")
+        Yields:
+            Tuple[int, Dict[str, str]]: (收件人索引, 收件人)，取出时状态更新为"发送中"
+        """
+        for index in indices:
+            if self._cancel_event.is_set():
+                return
+            recipient = recipients[index]
+            logger.debug("发送邮件到: %s", recipient.get('email'))
+            self._send_queue.put(("status", index, "发送中"))
+            yield index, recipient
+
+    def _drain_send_queue(self):
+        """
+        在主线程中处理发送队列中的消息，发送结束前定时轮询
+        
+        一次轮询内同一收件人的多次状态变化只保留最后一次，
+        合并后再交给收件人面板，表格在空闲时统一重绘。
+        发送期间重新导入、清空或编辑过的行已不是快照中的收件人，不再更新其状态。
+        """
+        statuses: Dict[int, str] = {}
+        finished = None
+        while finished is None:
+            try:
+                kind, index, value = self._send_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "status":
+                statuses[index] = value
+            else:
+                finished = (kind, value)
+        
+        if statuses:
+            current = self.recipients_panel.get_recipients()
+            for index, status in statuses.items():
+                if index < len(current) and current[index] is self._send_recipients[index]:
+                    self.recipients_panel.update_status_by_index(index, status)
+        
+        if finished is None:
+            self.window.after(self.SEND_POLL_MS, self._drain_send_queue)
+            return
+        
+        # 发送结束，恢复按钮状态
+        kind, value = finished
+        self.send_btn.configure(state="normal")
+        self.cancel_btn.configure(state="disabled")
+        if kind == "done":
             messagebox.showinfo("成功", "邮件发送完成")
-            
-        except Exception as e:
-            error_msg = f"发送失败: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            messagebox.showerror("错误", error_msg)
+        elif kind == "cancelled":
+            messagebox.showinfo("已取消", "邮件发送已取消")
+        else:
+            messagebox.showerror("错误", value)
 
     def on_recipients_imported(self, success: bool):
         """
@@ -348,16 +482,18 @@ class EmailSenderWindow:
         - 翻页功能
         """
         logger.info("开始预览邮件")
+        # 同步尚未提交的模板输入
+        self.template_panel.flush_pending_changes()
         
-        # 获取收件人列表
-        recipients = self.recipients_panel.get_recipients()
-        if not recipients:
+        # 获取收件人数量
+        count = self.recipients_panel.get_recipient_count()
+        if not count:
             logger.warning("收件人列表为空")
             messagebox.showerror("错误", "请先导入收件人列表")
             return
         
         # 获取前10个收件人（或实际数量）
-        preview_data = recipients[:min(10, len(recipients))]
+        preview_data = [self.recipients_panel.get_recipient(i) for i in range(min(10, count))]
         
         try:
             # 创建预览窗口
@@ -6,9 +6,10 @@
 """
 
 import smtplib
+import time
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Optional, Tuple
+from email.header import Header
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -28,8 +29,12 @@ class EmailService:
         sender_email: 发件人邮箱
         sender_password: 发件人密码
         _server: SMTP服务器连接对象
+        _last_activity: 最近一次与服务器成功交互的时间（time.monotonic）
+        KEEPALIVE_IDLE_SECONDS: 连接空闲超过该秒数后，发送前先用 NOOP 检查连接
     """
     
+    KEEPALIVE_IDLE_SECONDS = 30
+    
     def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str):
         """
         初始化邮件服务
@@ -46,6 +51,7 @@ class EmailService:
         self.sender_email = sender_email
         self.sender_password = sender_password
         self._server: Optional[smtplib.SMTP] = None
+        self._last_activity = 0.0
 
     def connect(self):
         """
@@ -58,6 +64,7 @@ class EmailService:
             self._server = smtplib.SMTP(self.smtp_server, self.smtp_port)
             self._server.starttls()
             self._server.login(self.sender_email, self.sender_password)
+            self._last_activity = time.monotonic()
             logger.debug("SMTP服务器连接成功")
         except Exception as e:
             error_msg = f"连接SMTP服务器失败: {str(e)}"
@@ -107,20 +114,75 @@ class EmailService:
             bool: 发送是否成功
         """
         try:
-            logger.info(f"发送邮件 - 收件人: {to_email}")
+            logger.info("发送邮件 - 收件人: %s", to_email)
             
-            if not self._server:
-                self.connect()
-
-            msg = MIMEMultipart()
-            msg['From'] = self.sender_email
+            msg = self._build_message(subject, content, is_html)
             msg['To'] = to_email
-            msg['Subject'] = subject
 
-            content_type = 'html' if is_html else 'plain'
-            msg.attach(MIMEText(content, content_type, 'utf-8'))
+            self._deliver(lambda: self._server.send_message(msg))
+            logger.debug("邮件发送成功")
+            return True
+            
+        except Exception as e:
+            error_msg = f"发送邮件失败: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return False
+
+    def send_many(self, messages: Iterable[Tuple[str, str, str, bool]]) -> Iterator[Tuple[str, bool]]:
+        """
+        使用同一个连接依次发送多封邮件
+        
+        只在首封邮件前连接和登录一次，每发送一封即返回其结果。
+        
+        Args:
+            messages: (收件人邮箱, 主题, 内容, 是否为HTML格式) 的可迭代对象
+            
+        Yields:
+            Tuple[str, bool]: (收件人邮箱, 发送是否成功)
+        """
+        if not self._server:
+            self.connect()
+        for to_email, subject, content, is_html in messages:
+            yield to_email, self.send_email(to_email, subject, content, is_html)
 
-            self._server.send_message(msg)
+    def prepare_payload(self, subject: str, content: str, is_html: bool = False) -> bytes:
+        """
+        预先编码可重复发送的邮件
+        
+        适用于主题和内容对所有收件人都相同的情况。邮件头和正文只序列化一次，
+        每次发送时只在前面加上收件人邮件头。
+        
+        Args:
+            subject: 邮件主题
+            content: 邮件内容
+            is_html: 是否为HTML格式
+            
+        Returns:
+            bytes: 不含收件人邮件头的完整邮件，配合 send_payload 使用
+        """
+        msg = self._build_message(subject, content, is_html)
+        # 字节形式的邮件由 smtplib 原样发送，因此直接按 SMTP 要求的 CRLF 序列化
+        return msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+
+    def send_payload(self, payload: bytes, to_email: str) -> bool:
+        """
+        将预先编码的邮件发送给指定收件人
+        
+        Args:
+            payload: prepare_payload 返回的邮件数据
+            to_email: 收件人邮箱
+            
+        Returns:
+            bool: 发送是否成功
+        """
+        try:
+            logger.info("发送邮件 - 收件人: %s", to_email)
+            
+            # 收件人邮件头直接拼接在已编码的邮件前，需拒绝换行符以防注入额外的邮件头
+            if '\r' in to_email or '\n' in to_email:
+                raise ValueError(f"收件人地址包含换行符: {to_email!r}")
+            to_header = f"To: {to_email}".encode('utf-8') + b"\r\n"
+            self._deliver(lambda: self._server.sendmail(self.sender_email, [to_email], to_header + payload))
             logger.debug("邮件发送成功")
             return True
             
@@ -129,6 +191,67 @@ class EmailService:
             logger.error(error_msg, exc_info=True)
             return False
 
+    def _ensure_alive(self):
+        """
+        确保连接可用
+        
+        未连接时建立连接；连接空闲较久时先发送 NOOP，服务器已断开空闲连接则重新连接。
+        连接刚使用过时不做检查，连续发送时不会增加额外的往返。
+        """
+        if not self._server:
+            self.connect()
+            return
+        if time.monotonic() - self._last_activity < self.KEEPALIVE_IDLE_SECONDS:
+            return
+        try:
+            status, _ = self._server.noop()
+            if status != 250:
+                raise smtplib.SMTPResponseException(status, "NOOP 失败")
+            self._last_activity = time.monotonic()
+        except Exception as e:
+            logger.info(f"SMTP连接已失效，重新连接: {str(e)}")
+            self.disconnect()
+            self.connect()
+
+    def _deliver(self, send: Callable[[], object]):
+        """
+        在可用的连接上执行发送操作，连接中途断开时重新连接并重试一次
+        
+        Args:
+            send: 使用 self._server 发送邮件的函数
+        """
+        self._ensure_alive()
+        try:
+            send()
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException) as e:
+            # 只有断开连接或服务器关闭会话（421）时重试，其他拒收错误直接抛出
+            if isinstance(e, smtplib.SMTPResponseException) and e.smtp_code != 421:
+                raise
+            logger.info(f"SMTP连接已断开，重新连接后重试: {str(e)}")
+            self.disconnect()
+            self.connect()
+            send()
+        self._last_activity = time.monotonic()
+
+    def _build_message(self, subject: str, content: str, is_html: bool) -> MIMEText:
+        """
+        构建不含收件人的邮件对象
+        
+        Args:
+            subject: 邮件主题
+            content: 邮件内容
+            is_html: 是否为HTML格式
+            
+        Returns:
+            MIMEText: 已设置发件人和主题的邮件对象
+        """
+        # 只有一个正文部分，无需 multipart 封装
+        content_type = 'html' if is_html else 'plain'
+        msg = MIMEText(content, content_type, 'utf-8')
+        msg['From'] = self.sender_email
+        msg['Subject'] = Header(subject, 'utf-8')
+        return msg
+
     def __enter__(self):
         """上下文管理器入口"""
         self.connect()
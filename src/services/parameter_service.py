@@ -5,11 +5,41 @@
 支持参数的添加、删除、验证和显示名称管理。
 """
 
-from typing import List, Dict, Set, Tuple
+import functools
+import re
+import sys
+from types import MappingProxyType
+from typing import AbstractSet, Any, Callable, List, Dict, Mapping, Set, Tuple
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# 参数标识符只允许字母、数字和下划线，且不能全为下划线
+_IDENTIFIER_RE = re.compile(r'\w*[^\W_]\w*')
+
+
+def _cached_by_version(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    按参数版本号缓存无参类方法的结果
+
+    缓存键为 (方法名, 当前版本号)，参数增删时版本号递增，旧结果随之失效。
+    返回的缓存对象为共享对象，调用方不应修改。
+
+    Args:
+        func: 被装饰的类方法函数（仅接收 cls 参数）
+
+    Returns:
+        Callable[[Any], Any]: 带缓存的函数
+    """
+    @functools.wraps(func)
+    def wrapper(cls):
+        key = (func.__name__, cls._version)
+        if key not in cls._cache:
+            cls._cache[key] = func(cls)
+        return cls._cache[key]
+    return wrapper
+
+
 class ParameterService:
     """
     参数管理服务类
@@ -21,15 +51,20 @@ class ParameterService:
     - 显示名称管理
     
     Attributes:
-        _custom_params: 自定义参数列表，每项为 (显示名称, 标识符) 元组
+        _custom_params: 自定义参数字典，小写标识符到 (显示名称, 标识符) 的映射，按添加顺序排列
         _SYSTEM_PARAMS: 系统默认参数字典
+        _version: 参数版本号，每次增删参数时递增
+        _cache: 按版本号缓存的查询结果
     """
     
-    _custom_params: List[Tuple[str, str]] = []  # [(显示名称, 标识符)]
+    _custom_params: Dict[str, Tuple[str, str]] = {}  # {小写标识符: (显示名称, 标识符)}
+    _version = 0
+    _cache: Dict[Tuple[str, int], Any] = {}
     _SYSTEM_PARAMS = {
         'email': '邮箱地址',
         'name': '收件人姓名'
     }
+    _SYSTEM_PARAMS_VIEW: Mapping[str, str] = MappingProxyType(_SYSTEM_PARAMS)
     
     @classmethod
     def add_param(cls, display_name: str, identifier: str) -> Tuple[bool, str]:
@@ -45,15 +80,15 @@ class ParameterService:
         """
         logger.info(f"添加自定义参数 - 显示名称: {display_name}, 标识符: {identifier}")
         
-        # 验证参数标识符
-        existing_ids = {id for _, id in cls._custom_params}
-        is_valid, error_msg = cls.validate_param_identifier(identifier, existing_ids)
+        # 验证参数标识符，字典的键即为小写标识符集合
+        is_valid, error_msg = cls.validate_param_identifier(identifier, cls._custom_params.keys())
         if not is_valid:
             logger.warning(f"参数标识符验证失败: {error_msg}")
             return False, error_msg
             
-        # 添加参数
-        cls._custom_params.append((display_name, identifier))
+        # 添加参数，以小写标识符为键，保留原始写法用于显示和列名
+        cls._custom_params[identifier.lower()] = (display_name, identifier)
+        cls._bump_version()
         logger.debug("参数添加成功")
         return True, ""
     
@@ -69,46 +104,60 @@ class ParameterService:
             bool: 是否成功移除
         """
         logger.info(f"移除自定义参数 - 标识符: {identifier}")
-        for i, (_, param_id) in enumerate(cls._custom_params):
-            if param_id.lower() == identifier.lower():
-                cls._custom_params.pop(i)
-                logger.debug("参数移除成功")
-                return True
+        if cls._custom_params.pop(identifier.lower(), None) is not None:
+            cls._bump_version()
+            logger.debug("参数移除成功")
+            return True
         logger.warning("未找到要移除的参数")
         return False
+
+    @classmethod
+    def _bump_version(cls):
+        """递增参数版本号并清除过期的缓存结果"""
+        cls._version += 1
+        cls._cache.clear()
     
     @classmethod
-    def get_custom_params(cls) -> List[Tuple[str, str]]:
+    @_cached_by_version
+    def get_custom_params(cls) -> Tuple[Tuple[str, str], ...]:
         """
         获取所有自定义参数
         
+        结果为按参数版本号缓存的只读元组，需要修改时请自行转换为列表。
+        
         Returns:
-            List[Tuple[str, str]]: 自定义参数列表，每个元素为 (显示名称, 标识符)
+            Tuple[Tuple[str, str], ...]: 自定义参数，每个元素为 (显示名称, 标识符)
         """
-        return cls._custom_params.copy()
+        return tuple(cls._custom_params.values())
     
     @classmethod
+    @_cached_by_version
     def get_custom_param_identifiers(cls) -> List[str]:
         """
         获取自定义参数标识符列表
         
+        结果按参数版本号缓存，调用方不应修改返回的列表。
+        
         Returns:
             List[str]: 参数标识符列表
         """
-        return [identifier for _, identifier in cls._custom_params]
+        return [identifier for _, identifier in cls._custom_params.values()]
     
     @classmethod
+    @_cached_by_version
     def get_all_param_display_names(cls) -> Dict[str, str]:
         """
         获取所有参数的显示名称（包括默认参数和自定义参数）
         
+        结果按参数版本号缓存，调用方不应修改返回的字典。
+        
         Returns:
             Dict[str, str]: 参数标识符到显示名称的映射
         """
         names = dict(cls.get_default_params())  # 获取默认参数
         # 添加自定义参数
-        for display_name, identifier in cls._custom_params:
-            names[identifier.lower()] = display_name
+        for key, (display_name, _) in cls._custom_params.items():
+            names[key] = display_name
         return names
     
     @classmethod
@@ -116,9 +165,10 @@ class ParameterService:
         """清空所有自定义参数"""
         logger.info("清空所有自定义参数")
         cls._custom_params.clear()
+        cls._bump_version()
 
     @staticmethod
-    def validate_param_identifier(identifier: str, existing_ids: Set[str]) -> Tuple[bool, str]:
+    def validate_param_identifier(identifier: str, existing_ids: AbstractSet[str]) -> Tuple[bool, str]:
         """
         验证参数标识符
         
@@ -126,7 +176,7 @@ class ParameterService:
         
         Args:
             identifier: 参数标识符
-            existing_ids: 现有的参数标识符集合
+            existing_ids: 现有的参数标识符集合，元素须已转为小写
             
         Returns:
             Tuple[bool, str]: (是否有效, 错误信息)
@@ -139,12 +189,12 @@ class ParameterService:
             return False, "参数标识符不能为空"
             
         # 检查是否重复（不区分大小写）
-        if identifier.lower() in {id.lower() for id in existing_ids}:
+        if identifier.lower() in existing_ids:
             logger.warning("参数标识符重复")
             return False, "参数标识符已存在"
             
         # 检查格式（只允许字母、数字和下划线）
-        if not identifier.replace('_', '').isalnum():
+        if not _IDENTIFIER_RE.fullmatch(identifier):
             logger.warning("参数标识符格式不正确")
             return False, "参数标识符只能包含字母、数字和下划线"
             
@@ -152,28 +202,47 @@ class ParameterService:
         return True, ""
 
     @classmethod
-    def get_system_params(cls) -> Dict[str, str]:
+    def get_system_params(cls) -> Mapping[str, str]:
         """
         获取系统参数
         
+        返回只读视图，需要修改时请自行复制。
+        
         Returns:
-            Dict[str, str]: 系统参数的显示名称映射
+            Mapping[str, str]: 系统参数的显示名称映射
         """
-        return cls._SYSTEM_PARAMS.copy()
+        return cls._SYSTEM_PARAMS_VIEW
     
     @classmethod
     def get_display_columns(cls, custom_params: List[str]) -> List[str]:
         """
         获取显示列的顺序（包括系统参数和自定义参数）
         
+        返回的列标识符经过 sys.intern 驻留，与CSV列名为同一对象，按列取值时可直接按引用匹配。
+        结果按参数元组缓存，每次调用返回新的列表，调用方可以修改。
+        
         Args:
             custom_params: 自定义参数列表
             
         Returns:
             List[str]: 显示列的顺序
         """
+        return list(cls._build_display_columns(tuple(custom_params)))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _build_display_columns(custom_params: Tuple[str, ...]) -> Tuple[str, ...]:
+        """
+        构建显示列的顺序
+        
+        Args:
+            custom_params: 自定义参数元组
+            
+        Returns:
+            Tuple[str, ...]: 显示列的顺序
+        """
         # 固定顺序：email, name, 自定义参数
-        return ["email", "name"] + custom_params
+        return ("email", "name") + tuple(sys.intern(param) for param in custom_params)
     
     @classmethod
     def get_column_display_name(cls, column: str) -> str:
@@ -186,23 +255,32 @@ class ParameterService:
         Returns:
             str: 显示名称
         """
-        # 先检查是否是系统参数
-        if column.lower() in cls._SYSTEM_PARAMS:
-            return cls._SYSTEM_PARAMS[column.lower()]
-        
-        # 再检查是否是自定义参数
-        for display_name, identifier in cls._custom_params:
-            if identifier.lower() == column.lower():
-                return display_name
-                
-        # 如果都不是，返回原始标识符
-        return column
-    
+        # 都不是系统参数或自定义参数时，返回原始标识符
+        return cls._get_column_display_names().get(column.lower(), column)
+
     @classmethod
-    def get_column_widths(cls) -> Dict[str, int]:
+    @_cached_by_version
+    def _get_column_display_names(cls) -> Dict[str, str]:
+        """
+        获取小写列标识符到显示名称的映射
+        
+        系统参数优先于同名的自定义参数。结果按参数版本号缓存。
+        
+        Returns:
+            Dict[str, str]: 小写列标识符到显示名称的映射
+        """
+        names = {key: display_name for key, (display_name, _) in cls._custom_params.items()}
+        names.update(cls._SYSTEM_PARAMS)
+        return names
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def get_column_widths() -> Dict[str, int]:
         """
         获取列的默认宽度
         
+        默认宽度固定不变，仅在首次调用时构建，调用方不应修改返回的字典。
+        
         Returns:
             Dict[str, int]: 列标识符到宽度的映射
         """
@@ -216,36 +294,41 @@ class ParameterService:
         """
         同步参数到数据中
         
+        直接在原数据上修改：删除无效的列，补齐缺失的参数列（值为空字符串），
+        不再为每行重建字典。
+        
         Args:
             params: 参数列表
             data: 原始数据
             
         Returns:
-            List[Dict[str, str]]: 更新后的数据
+            List[Dict[str, str]]: 更新后的数据（即传入的 data）
         """
         logger.info("同步参数到数据")
         # 系统参数和自定义参数列
         valid_columns = set(cls._SYSTEM_PARAMS.keys()) | set(params)
-        updated_data = []
+        # 状态列存在时保留，但不补齐
+        keep_columns = valid_columns | {'status'}
         
         for row in data:
-            new_row = {}
-            # 保留有效的列和状态列
-            for col in valid_columns:
-                new_row[col] = row.get(col, "")
-            # 保留状态列
-            if 'status' in row:
-                new_row['status'] = row['status']
-            updated_data.append(new_row)
+            # 删除无效的列
+            for col in [col for col in row if col not in keep_columns]:
+                del row[col]
+            # 补齐缺失的参数列
+            for col in valid_columns.difference(row):
+                row[col] = ""
             
-        logger.debug(f"数据同步完成，共 {len(updated_data)} 条记录")
-        return updated_data
+        logger.debug(f"数据同步完成，共 {len(data)} 条记录")
+        return data
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_default_params() -> Dict[str, str]:
         """
         获取默认参数
         
+        默认参数固定不变，仅在首次调用时构建，调用方不应修改返回的字典。
+        
         Returns:
             Dict[str, str]: 默认参数的显示名称和标识符映射
         """
@@ -255,19 +338,18 @@ class ParameterService:
         }
 
     @staticmethod
-    def validate_required_params(headers: Set[str]) -> Tuple[bool, Set[str]]:
+    def validate_required_params(headers_lower: AbstractSet[str]) -> Tuple[bool, Set[str]]:
         """
-        验证必需参数是否存在
+        验证必需参数是否存在（不区分大小写）
         
         Args:
-            headers: 当前的参数集合
+            headers_lower: 当前的参数集合，元素须已转为小写
             
         Returns:
             Tuple[bool, Set[str]]: (是否有效, 缺失的参数集合)
         """
         logger.debug("验证必需参数")
         required = {'name', 'email'}
-        headers_lower = {h.lower() for h in headers}
         missing = required - headers_lower
         
         if missing:
@@ -303,15 +385,32 @@ class ParameterService:
         Returns:
             Tuple[bool, Set[str]]: (是否验证通过, 未定义的参数集合)
         """
-        logger.debug("验证模板参数")
-        # 将参数转换为小写进行比较
-        template_params_lower = {p.lower() for p in template_params}
+        # 将可用参数转换为小写进行比较
         available_params_lower = {p.lower() for p in available_params}
-        undefined_params = template_params_lower - available_params_lower
+        return ParameterService.validate_template_params_lower(template_params, available_params_lower)
+
+    @staticmethod
+    def validate_template_params_lower(template_params: Set[str],
+                                       available_params_lower: AbstractSet[str]) -> Tuple[bool, Set[str]]:
+        """
+        验证模板参数是否都已定义，可用参数已预先转为小写
         
-        if undefined_params:
-            logger.warning(f"发现未定义的模板参数: {undefined_params}")
-        else:
-            logger.debug("模板参数验证通过")
+        调用方可以缓存小写的可用参数集合，避免每次验证都重新转换。
+        
+        Args:
+            template_params: 模板中使用的参数集合
+            available_params_lower: 可用参数集合，元素须已转为小写
             
-        return len(undefined_params) == 0, undefined_params 
\ No newline at end of file
+        Returns:
+            Tuple[bool, Set[str]]: (是否验证通过, 未定义的参数集合)
+        """
+        logger.debug("验证模板参数")
+        template_params_lower = {p.lower() for p in template_params}
+        # 常见的验证通过情况只做子集判断，不生成差集
+        if template_params_lower <= available_params_lower:
+            logger.debug("模板参数验证通过")
+            return True, set()
+        
+        undefined_params = template_params_lower - available_params_lower
+        logger.warning(f"发现未定义的模板参数: {undefined_params}")
+        return False, undefined_params 
\ No newline at end of file
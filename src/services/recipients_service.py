@@ -5,7 +5,7 @@
 状态更新、数据验证等功能。支持模板参数验证和数据同步。
 """
 
-from typing import List, Dict, Set, Tuple
+from typing import FrozenSet, List, Dict, Optional, Set, Tuple
 from src.utils.csv_handler import CSVHandler
 from src.services.parameter_service import ParameterService
 from src.utils.logger import setup_logger
@@ -24,38 +24,49 @@ class RecipientsService:
     
     Attributes:
         recipients_data: 收件人数据列表，每项为一个字典
+        _by_email: 邮箱到收件人数据的索引，邮箱重复时指向第一条
+        _headers_lower: 第一条收件人数据的小写列名集合，用于模板参数验证
     """
     
     def __init__(self):
         """初始化收件人服务"""
         logger.info("初始化收件人数据管理服务")
         self.recipients_data: List[Dict[str, str]] = []
+        self._by_email: Dict[str, Dict[str, str]] = {}
+        self._headers_lower: FrozenSet[str] = frozenset()
     
-    def import_csv(self, file_path: str) -> Tuple[bool, str, List[Dict[str, str]]]:
+    def import_csv(self, file_path: str,
+                   data: Optional[List[Dict[str, str]]] = None) -> Tuple[bool, str, List[Dict[str, str]]]:
         """
         导入CSV文件
         
-        读取并验证CSV文件内容，确保包含必需的字段。
+        逐行读取并验证CSV文件内容，确保包含必需的字段。
+        必需字段在读取第一行后即验证，验证通过的行随即追加到 data 中，
+        其他线程可以在导入过程中读取已解析的部分。导入成功后才替换当前数据。
         
         Args:
             file_path: CSV文件路径
+            data: 接收导入数据的列表，默认新建
             
         Returns:
             Tuple[bool, str, List[Dict[str, str]]]: (是否成功, 错误信息, 导入的数据)
         """
+        if data is None:
+            data = []
         try:
             logger.info(f"开始导入CSV文件: {file_path}")
             
             # 读取CSV文件
-            data = CSVHandler.read_recipients(file_path)
+            rows = CSVHandler.iter_recipients(file_path)
+            first_row = next(rows, None)
             
-            if not data:
+            if first_row is None:
                 logger.warning("CSV文件为空")
                 return False, "CSV文件为空", []
             
-            # 验证必需字段
-            headers = set(data[0].keys())
-            is_valid, missing_params = ParameterService.validate_required_params(headers)
+            # 验证必需字段，列名只在这里统一转换一次小写
+            headers_lower = frozenset(h.lower() for h in first_row)
+            is_valid, missing_params = ParameterService.validate_required_params(headers_lower)
             if not is_valid:
                 error_msg = (
                     f"CSV文件缺少必需的参数列：{', '.join(missing_params)}\n"
@@ -64,13 +75,19 @@ class RecipientsService:
                     "- name 或 Name（收件人姓名）"
                 )
                 logger.warning(f"CSV文件验证失败: {error_msg}")
+                rows.close()
                 return False, error_msg, []
             
             # 添加状态列
-            for recipient in data:
+            first_row['status'] = "待发送"
+            data.append(first_row)
+            for recipient in rows:
                 recipient['status'] = "待发送"
+                data.append(recipient)
             
             self.recipients_data = data
+            self._rebuild_email_index()
+            self._headers_lower = headers_lower | {'status'}
             logger.info(f"成功导入 {len(data)} 条收件人数据")
             return True, "", data
             
@@ -112,6 +129,13 @@ class RecipientsService:
         """清空收件人数据"""
         logger.info("清空收件人数据")
         self.recipients_data = []
+        self._by_email = {}
+        self._headers_lower = frozenset()
+
+    def _rebuild_email_index(self) -> None:
+        """根据当前数据重建邮箱索引"""
+        # 倒序构建，重复的邮箱最终保留第一条，与逐行查找的结果一致
+        self._by_email = {r.get('email'): r for r in reversed(self.recipients_data)}
     
     def update_status(self, email: str, status: str) -> bool:
         """
@@ -124,15 +148,32 @@ class RecipientsService:
         Returns:
             bool: 是否找到并更新了状态
         """
-        logger.debug(f"更新收件人状态 - 邮箱: {email}, 状态: {status}")
-        for recipient in self.recipients_data:
-            if recipient['email'] == email:
-                recipient['status'] = status
-                logger.debug("状态更新成功")
-                return True
+        logger.debug("更新收件人状态 - 邮箱: %s, 状态: %s", email, status)
+        recipient = self._by_email.get(email)
+        if recipient is not None:
+            recipient['status'] = status
+            logger.debug("状态更新成功")
+            return True
         logger.warning(f"未找到收件人: {email}")
         return False
     
+    def update_status_by_index(self, index: int, status: str) -> bool:
+        """
+        按索引更新收件人状态
+        
+        Args:
+            index: 收件人索引
+            status: 新状态
+            
+        Returns:
+            bool: 索引是否有效并更新了状态
+        """
+        if 0 <= index < len(self.recipients_data):
+            self.recipients_data[index]['status'] = status
+            return True
+        logger.warning(f"收件人索引无效: {index}")
+        return False
+    
     def validate_template_params(self, template_params: Set[str]) -> Tuple[bool, Set[str]]:
         """
         验证模板参数是否都存在
@@ -150,8 +191,8 @@ class RecipientsService:
             logger.debug("收件人数据为空，跳过验证")
             return True, set()
             
-        headers = set(self.recipients_data[0].keys())
-        is_valid, undefined_params = ParameterService.validate_template_params(template_params, headers)
+        is_valid, undefined_params = ParameterService.validate_template_params_lower(
+            template_params, self._headers_lower)
         
         if not is_valid:
             logger.warning(f"发现未定义的模板参数: {undefined_params}")
@@ -169,6 +210,15 @@ class RecipientsService:
         """
         return self.recipients_data
     
+    def get_recipient_count(self) -> int:
+        """
+        获取收件人数量
+        
+        Returns:
+            int: 收件人数量
+        """
+        return len(self.recipients_data)
+    
     def get_recipient(self, index: int) -> Dict[str, str]:
         """
         获取指定索引的收件人
@@ -179,7 +229,7 @@ class RecipientsService:
         Returns:
             Dict[str, str]: 收件人数据
         """
-        logger.debug(f"获取收件人数据 - 索引: {index}")
+        logger.debug("获取收件人数据 - 索引: %s", index)
         return self.recipients_data[index]
     
     def update_recipient(self, index: int, data: Dict[str, str]) -> None:
@@ -192,7 +242,17 @@ class RecipientsService:
         """
         logger.debug(f"更新收件人数据 - 索引: {index}")
         if 0 <= index < len(self.recipients_data):
+            old = self.recipients_data[index]
             self.recipients_data[index] = data
+            old_email = old.get('email')
+            if old_email == data.get('email') and self._by_email.get(old_email) is old:
+                # 邮箱未变，只需让索引指向新的数据
+                self._by_email[old_email] = data
+            elif old_email != data.get('email'):
+                # 邮箱变化时重复邮箱的归属可能改变，重建索引
+                self._rebuild_email_index()
+            if index == 0:
+                self._headers_lower = frozenset(h.lower() for h in data)
             logger.debug("收件人数据更新成功")
         else:
             logger.warning(f"无效的索引: {index}") 
\ No newline at end of file
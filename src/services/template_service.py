@@ -5,13 +5,121 @@
 参数验证等功能。
 """
 
-from typing import Dict, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Mapping, Pattern, Set, Tuple
+import functools
+import io
+import itertools
+import logging
 import re
 from src.utils.logger import setup_logger
-import html
 
 logger = setup_logger(__name__)
 
+
+@functools.lru_cache(maxsize=32)
+def _compile_variable_pattern(keys: Tuple[str, ...]) -> Pattern:
+    """
+    编译匹配指定变量占位符的正则表达式
+    
+    Args:
+        keys: 已排序的变量名元组
+        
+    Returns:
+        Pattern: 匹配 {变量名} 的正则表达式，分组1为变量名
+    """
+    return re.compile(r'\{(' + '|'.join(map(re.escape, keys)) + r')\}')
+
+
+# 没有任何格式标签的字符共用的标签集合
+_NO_TAGS: FrozenSet[str] = frozenset()
+
+# HTML转义（与 html.escape 一致）并将空格替换为 &nbsp; 的字符映射表
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+    ' ': '&nbsp;',
+})
+
+# 匹配模板中的 {参数名}，用于提取模板参数
+_PARAM_RE = re.compile(r'\{([^}]+)\}')
+
+# 匹配 {变量名} 占位符或任意单个花括号，用于生成 str.format 格式串
+# 变量名与 replace_variables 一致，可以是任意不含花括号的文本（如带空格的CSV列名）
+_FORMAT_TOKEN_RE = re.compile(r'\{([^{}]+)\}|[{}]')
+
+# 只含字母、数字和下划线的变量名，可以直接作为 str.format 的字段名
+_WORD_NAME_RE = re.compile(r'\w+')
+
+# 别名字段名的前缀，直接使用的字段名只含字母、数字和下划线，不会与之冲突
+_ALIAS_PREFIX = '#'
+
+
+def _format_token(match) -> str:
+    """
+    将模板中的记号转换为格式串中的对应写法
+
+    纯数字的名称会被 str.format 视为位置参数，含空格、点号、冒号等字符的名称
+    会被当作属性、下标或格式说明解析，因此这些名称改写为十六进制编码的别名，
+    渲染时由 _KeepMissing 还原。其他花括号按字面量转义。
+
+    Args:
+        match: _FORMAT_TOKEN_RE 的匹配结果
+
+    Returns:
+        str: 格式串中的写法
+    """
+    name = match.group(1)
+    if name is None:
+        return match.group(0).replace('{', '{{').replace('}', '}}')
+    if name.isdigit() or not _WORD_NAME_RE.fullmatch(name):
+        return '{' + _ALIAS_PREFIX + name.encode('utf-8').hex() + '}'
+    return match.group(0)
+
+
+@functools.lru_cache(maxsize=256)
+def _build_style(tags: FrozenSet[str]) -> str:
+    """
+    根据格式标签集合生成内联样式
+
+    文档中不同的格式组合通常很少，同一组合只生成一次。
+    字体标签按名称排序输出，同一组合总是生成相同的样式字符串。
+
+    Args:
+        tags: 格式标签集合
+
+    Returns:
+        str: style 属性的值
+    """
+    styles = []
+    if 'bold' in tags:
+        styles.append('font-weight: bold')
+    if 'italic' in tags:
+        styles.append('font-style: italic')
+    if 'underline' in tags:
+        styles.append('text-decoration: underline')
+    for tag in sorted(tags):
+        if tag.startswith('font-family:'):
+            family = tag.split(':', 1)[1].strip()
+            styles.append(f"font-family: '{family}'")
+        elif tag.startswith('font-size:'):
+            size = tag.split(':', 1)[1].strip()
+            styles.append(f'font-size: {size}pt')
+    return '; '.join(styles)
+
+
+class _KeepMissing(dict):
+    """格式化时保留未定义变量的原始占位符，并将别名字段还原为原始变量名"""
+
+    def __missing__(self, key: str) -> str:
+        if key.startswith(_ALIAS_PREFIX):
+            key = bytes.fromhex(key[len(_ALIAS_PREFIX):]).decode('utf-8')
+            if key in self:
+                return self[key]
+        return '{' + key + '}'
+
 class TemplateService:
     """
     模板处理服务类
@@ -30,11 +138,15 @@ class TemplateService:
         _tags: 富文本格式标签
         _font_family: 字体族
         _font_size: 字号
+        _version: 模板版本号，每次模板数据变更时递增
+        _cache: 按版本号缓存的派生数据，名称到 (版本号, 结果) 的映射
     """
     
     def __init__(self):
         """初始化模板服务"""
         logger.info("初始化模板服务")
+        self._version = 0
+        self._cache: Dict[str, Tuple[int, Any]] = {}
         self._subject = ""
         self._content = ""
         self._is_html = True
@@ -43,7 +155,7 @@ class TemplateService:
         self._font_size = "12"
     
     def update_template(self, subject: str, content: str, is_html: bool,
-                       tags: Dict[str, list], font_family: str,
+                       tags: Mapping[int, list], font_family: str,
                        font_size: str) -> None:
         """
         更新模板数据
@@ -52,7 +164,8 @@ class TemplateService:
             subject: 邮件主题
             content: 邮件正文
             is_html: 是否为HTML格式
-            tags: 富文本格式标签
+            tags: 富文本格式标签，字符绝对位置（整数）到标签列表的映射。
+                直接保存引用而不复制，可以传入只读映射，调用方不应再修改
             font_family: 字体族
             font_size: 字号
         """
@@ -63,23 +176,88 @@ class TemplateService:
         self._tags = tags
         self._font_family = font_family
         self._font_size = font_size
+        self._version += 1
         logger.debug(f"模板更新完成 - 格式: {'HTML' if is_html else '纯文本'}")
     
+    def update_text(self, subject: str, content: str) -> None:
+        """
+        仅更新模板的主题和正文文本
+        
+        用于只有文本变化、格式标签不受影响的场景。文本未变化时不递增版本号，
+        基于模板的缓存继续有效。
+        
+        Args:
+            subject: 邮件主题
+            content: 邮件正文
+        """
+        if subject == self._subject and content == self._content:
+            return
+        logger.debug("更新模板文本")
+        self._subject = subject
+        self._content = content
+        self._version += 1
+    
     def get_template(self) -> Dict[str, any]:
         """
         获取当前模板数据
         
+        结果按模板版本号缓存，调用方不应修改返回的字典。
+        
         Returns:
             Dict[str, any]: 包含模板所有数据的字典
         """
-        return {
+        return self._cached('template', lambda: {
             'subject': self._subject,
             'content': self._content,
             'is_html': self._is_html,
             'tags': self._tags,
             'font_family': self._font_family,
             'font_size': self._font_size
-        }
+        })
+
+    def get_template_param_set(self) -> Set[str]:
+        """
+        获取当前模板主题和正文中使用的参数
+        
+        结果按模板版本号缓存，调用方不应修改返回的集合。
+        
+        Returns:
+            Set[str]: 参数集合
+        """
+        return self._cached('params', lambda: TemplateService.get_template_params(
+            self._subject, self._content))
+
+    def get_compiled_template(self) -> Tuple[str, str]:
+        """
+        获取发送用的主题和正文格式串
+        
+        HTML格式时正文为转换后的HTML。格式串由 compile_format 生成，
+        每个收件人只需调用 render_format 替换变量。结果按模板版本号缓存。
+        
+        Returns:
+            Tuple[str, str]: (主题格式串, 正文格式串)
+        """
+        def build() -> Tuple[str, str]:
+            content = self.get_html_content() if self._is_html else self._content
+            return (TemplateService.compile_format(self._subject),
+                    TemplateService.compile_format(content))
+        return self._cached('compiled', build)
+
+    def _cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """
+        按模板版本号缓存派生数据
+        
+        Args:
+            name: 缓存名称
+            build: 生成数据的函数
+            
+        Returns:
+            Any: 当前版本对应的数据
+        """
+        entry = self._cache.get(name)
+        if entry is None or entry[0] != self._version:
+            entry = self._cache[name] = (self._version, build())
+        return entry[1]
     
     def clear_template(self) -> None:
         """清空模板数据"""
@@ -90,6 +268,19 @@ class TemplateService:
         self._tags = {}
         self._font_family = "Times New Roman"
         self._font_size = "12"
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """
+        获取模板版本号
+        
+        模板数据每次变更后版本号递增，可用于判断基于模板的缓存是否过期。
+        
+        Returns:
+            int: 当前模板版本号
+        """
+        return self._version
 
     @staticmethod
     def replace_variables(template: str, variables: Dict[str, str]) -> str:
@@ -105,18 +296,62 @@ class TemplateService:
         Returns:
             str: 替换变量后的字符串
         """
-        logger.debug(f"替换模板变量 - 变量列表: {list(variables.keys())}")
-        result = template
-        for key, value in variables.items():
-            result = result.replace('{' + key + '}', value)
-        return result
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("替换模板变量 - 变量列表: %s", list(variables))
+        if not variables:
+            return template
+        # 单次扫描模板，按变量名查表替换
+        pattern = _compile_variable_pattern(tuple(sorted(variables)))
+        return pattern.sub(lambda m: variables[m.group(1)], template)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def compile_format(template: str) -> str:
+        """
+        将模板转换为 str.format_map 可用的格式串
+        
+        保留 {变量名} 占位符（不能直接作为字段名的变量名改写为别名，由 render_format 还原），
+        其余花括号转义为字面量。同一模板只转换一次，之后每个收件人只需一次 format_map 调用。
+        
+        Args:
+            template: 包含变量的模板字符串
+            
+        Returns:
+            str: 格式串
+        """
+        return _FORMAT_TOKEN_RE.sub(_format_token, template)
+
+    @staticmethod
+    def render_format(template_format: str, variables: Dict[str, str]) -> str:
+        """
+        使用格式串替换变量
+        
+        与 replace_variables 一致，未定义的变量保持 {变量名} 原样。
+        
+        Args:
+            template_format: compile_format 生成的格式串
+            variables: 变量名和值的字典
+            
+        Returns:
+            str: 替换变量后的字符串
+        """
+        return template_format.format_map(_KeepMissing(variables))
 
     def get_html_content(self) -> str:
         """
         将文本内容转换为HTML格式
 
         根据标签信息将纯文本转换为带格式的HTML。支持对选中文本段落设置不同的格式，
-        并对HTML中保留原始文本的空格和换行。
+        并对HTML中保留原始文本的空格和换行。结果按模板版本号缓存，模板更新后重新生成。
+
+        Returns:
+            str: HTML格式的内容
+        """
+        return self._cached('html', self._build_html_content)
+
+    def _build_html_content(self) -> str:
+        """
+        生成文本内容对应的HTML
 
         Returns:
             str: HTML格式的内容
@@ -131,7 +366,27 @@ class TemplateService:
         #     '</head>',
         #     f'<body style="margin: 0; padding: 10px; font-family: \'{self._font_family}\'; font-size: {self._font_size}pt;">'
         # ]
-        html_lines = []
+        if not self._tags:
+            return self._build_plain_html_body()
+        return self._build_html_body()
+
+    def _build_html_body(self) -> str:
+        """
+        按格式标签生成正文段落的HTML
+
+        Returns:
+            str: 正文段落的HTML
+        """
+        buf = io.StringIO()
+        write = buf.write
+
+        # 预先计算每个字符位置的格式标签集合（过滤掉 'sel'），未设置格式的位置共用空集合
+        # 位置键通常为整数，也兼容字符串形式的位置
+        tags_at = [_NO_TAGS] * len(self._content)
+        for key, tags in self._tags.items():
+            index = int(key)
+            if 0 <= index < len(tags_at):
+                tags_at[index] = frozenset(tag for tag in tags if tag != 'sel')
 
         paragraphs = self._content.split('\n')
         current_pos = 0  # 用于跟踪文本中字符的绝对位置
@@ -143,65 +398,57 @@ class TemplateService:
                     # 如果连续遇到空行，则仅更新位置，不输出重复的空行
                     current_pos += 1
                     continue
-                html_lines.append('<p>&nbsp;</p>')
+                write('<p>&nbsp;</p>\n')
                 last_empty = True
                 current_pos += 1  # 空行也占一个换行符位置
                 continue
 
             last_empty = False
-            html_lines.append('<p>')
+            write('<p>')
 
+            # 按连续具有相同格式的区间分组，区间长度在C层统计
             pos = 0
-            while pos < len(paragraph):
-                # 获取当前位置所有格式标签，过滤掉 'sel'
-                current_tags = {tag for tag in self._tags.get(str(current_pos + pos), []) if tag != 'sel'}
-
-                # 确定连续具有相同格式的区间
-                end_pos = pos + 1
-                while end_pos < len(paragraph):
-                    next_tags = {tag for tag in self._tags.get(str(current_pos + end_pos), []) if tag != 'sel'}
-                    if next_tags != current_tags:
-                        break
-                    end_pos += 1
-
-                # 取出本区间的文本，先进行HTML转义再替换空格
-                segment = paragraph[pos:end_pos]
-                escaped_text = html.escape(segment)
-                escaped_text = escaped_text.replace(' ', '&nbsp;')
+            for current_tags, run in itertools.groupby(
+                    tags_at[current_pos:current_pos + len(paragraph)]):
+                end_pos = pos + len(list(run))
+
+                # 取出本区间的文本，一次完成HTML转义和空格替换
+                escaped_text = paragraph[pos:end_pos].translate(_HTML_ESCAPE_TABLE)
 
                 # 根据格式标签构建内联样式
                 if current_tags:
-                    styles = []
-                    if 'bold' in current_tags:
-                        styles.append('font-weight: bold')
-                    if 'italic' in current_tags:
-                        styles.append('font-style: italic')
-                    if 'underline' in current_tags:
-                        styles.append('text-decoration: underline')
-                    for tag in current_tags:
-                        if tag.startswith('font-family:'):
-                            parts = tag.split(':', 1)
-                            if len(parts) == 2:
-                                family = parts[1].strip()
-                                styles.append(f"font-family: '{family}'")
-                        elif tag.startswith('font-size:'):
-                            parts = tag.split(':', 1)
-                            if len(parts) == 2:
-                                size = parts[1].strip()
-                                styles.append(f'font-size: {size}pt')
-                    style_attr = '; '.join(styles)
-                    html_lines.append(f'<span style="{style_attr}">{escaped_text}</span>')
+                    style_attr = _build_style(current_tags)
+                    write(f'<span style="{style_attr}">{escaped_text}</span>')
                 else:
-                    html_lines.append(escaped_text)
+                    write(escaped_text)
 
                 pos = end_pos
 
-            html_lines.append('</p>')
+            write('</p>\n')
             current_pos += len(paragraph) + 1  # 加上换行符的长度
 
-        # html_lines.append('</body>')
-        # html_lines.append('</html>')
+        # 段落之间以换行分隔，末尾不保留换行
+        return buf.getvalue()[:-1]
+
+    def _build_plain_html_body(self) -> str:
+        """
+        生成没有格式标签的正文段落的HTML
+
+        整段文本只做一次转义，再按段落输出，输出与逐区间处理的结果一致。
 
+        Returns:
+            str: 正文段落的HTML
+        """
+        html_lines = []
+        last_empty = False  # 标记上一段是否为空
+        for paragraph in self._content.translate(_HTML_ESCAPE_TABLE).split('\n'):
+            if paragraph:
+                html_lines.append(f'<p>{paragraph}</p>')
+                last_empty = False
+            elif not last_empty:
+                # 连续的空行只输出一个
+                html_lines.append('<p>&nbsp;</p>')
+                last_empty = True
         return '\n'.join(html_lines)
 
     @staticmethod
@@ -217,8 +464,7 @@ class TemplateService:
         Returns:
             Set[str]: 参数集合
         """
-        pattern = r'\{([^}]+)\}'
-        params = set(re.findall(pattern, text))
+        params = set(_PARAM_RE.findall(text))
         logger.debug(f"提取模板参数 - 参数列表: {params}")
         return params
 
@@ -237,9 +483,8 @@ class TemplateService:
             Set[str]: 参数集合
         """
         logger.debug("获取模板中的所有参数")
-        subject_params = TemplateService.validate_template_params(subject)
-        content_params = TemplateService.validate_template_params(content)
-        all_params = subject_params | content_params
+        all_params = set(_PARAM_RE.findall(subject))
+        all_params.update(_PARAM_RE.findall(content))
         logger.debug(f"找到的参数: {all_params}")
         return all_params
 
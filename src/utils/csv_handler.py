@@ -6,7 +6,8 @@ CSV文件处理模块
 """
 
 import csv
-from typing import List, Dict, Set
+import sys
+from typing import Iterator, List, Dict, Set
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -35,6 +36,27 @@ class CSVHandler:
         Returns:
             List[Dict[str, str]]: 收件人信息列表
             
+        Raises:
+            FileNotFoundError: 文件不存在
+            UnicodeDecodeError: 文件编码错误
+            csv.Error: CSV格式错误
+        """
+        return list(CSVHandler.iter_recipients(file_path))
+
+    @staticmethod
+    def iter_recipients(file_path: str) -> Iterator[Dict[str, str]]:
+        """
+        逐行读取收件人CSV文件
+        
+        边读取边返回每行数据，调用方无需等待整个文件解析完成。
+        文件在迭代结束或生成器关闭时关闭。
+        
+        Args:
+            file_path: CSV文件路径
+            
+        Yields:
+            Dict[str, str]: 一个收件人的信息，列名作为键
+            
         Raises:
             FileNotFoundError: 文件不存在
             UnicodeDecodeError: 文件编码错误
@@ -42,25 +64,26 @@ class CSVHandler:
         """
         logger.info(f"开始读取CSV文件: {file_path}")
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with open(file_path, 'r', encoding='utf-8', newline='') as file:
                 # 先读取一行获取列名
                 reader = csv.reader(file)
-                headers = [h.strip() for h in next(reader)]  # 保留原始列名，只去除空格
+                header_row = next(reader, None)
+                if header_row is None:
+                    logger.warning("CSV文件没有列名")
+                    return
+                # 保留原始列名，只去除空格；列名驻留后所有行共享同一组键对象
+                headers = [sys.intern(h.strip()) for h in header_row]
                 logger.debug(f"读取到的列名: {headers}")
                 
-                # 创建一个字典列表来存储数据
-                data = []
-                
                 # 读取剩余的行
+                count = 0
+                strip = str.strip
                 for row in reader:
-                    # 创建一个字典，使用原始列名
-                    row_dict = {}
-                    for header, value in zip(headers, row):
-                        row_dict[header] = value.strip()
-                    data.append(row_dict)
+                    # 创建一个字典，使用原始列名；zip 和 map 在C层完成逐列处理
+                    count += 1
+                    yield dict(zip(headers, map(strip, row)))
                 
-                logger.info(f"成功读取 {len(data)} 条记录")
-                return data
+                logger.info(f"成功读取 {count} 条记录")
                 
         except FileNotFoundError:
             error_msg = f"找不到文件: {file_path}"
@@ -125,13 +148,10 @@ class CSVHandler:
         logger.info(f"开始写入CSV文件: {file_path}")
         try:
             with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=columns)
-                writer.writeheader()
-                
-                for recipient in data:
-                    # 创建一个新字典，只包含要保存的列
-                    row = {k: recipient[k] for k in columns}
-                    writer.writerow(row)
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                # 每行只按列顺序取出要保存的值，整批交给 writerows 写出
+                writer.writerows([recipient[k] for k in columns] for recipient in data)
                     
             logger.info(f"成功写入 {len(data)} 条记录")
             
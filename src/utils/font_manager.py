@@ -6,7 +6,7 @@
 """
 
 from tkinter.font import Font
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -24,6 +24,7 @@ class FontManager:
         default_family: 默认字体族
         default_size: 默认字号
         _current_font: 当前字体对象
+        _fonts: 按完整字体属性缓存的字体对象
     """
     
     def __init__(self):
@@ -32,6 +33,7 @@ class FontManager:
         self.default_family = 'Times New Roman'
         self.default_size = 12
         self._current_font: Optional[Font] = None
+        self._fonts: Dict[Tuple[str, int, str, str, bool], Font] = {}
         logger.debug(f"设置默认字体: {self.default_family}, 字号: {self.default_size}")
 
     def create_font(self, family: Optional[str] = None, size: Optional[int] = None,
@@ -39,8 +41,9 @@ class FontManager:
         """
         创建字体对象
         
-        根据指定的属性创建新的字体对象。如果未指定某些属性，
-        将使用默认值。
+        根据指定的属性创建字体对象。如果未指定某些属性，
+        将使用默认值。相同属性的字体只创建一次，之后返回同一对象，
+        调用方不应修改返回的字体。
         
         Args:
             family: 字体族
@@ -52,19 +55,33 @@ class FontManager:
         Returns:
             Font: 字体对象
         """
-        logger.debug(
-            f"创建字体 - 字体族: {family or self.default_family}, "
-            f"字号: {size or self.default_size}, "
-            f"字重: {weight}, 斜体: {slant}, 下划线: {underline}"
-        )
+        key = (family or self.default_family, size or self.default_size,
+               weight, slant, bool(underline))
+        font = self._fonts.get(key)
+        if font is None:
+            logger.debug(
+                f"创建字体 - 字体族: {key[0]}, 字号: {key[1]}, "
+                f"字重: {weight}, 斜体: {slant}, 下划线: {underline}"
+            )
+            font = self._fonts[key] = self._new_font(*key)
+        return font
+
+    @staticmethod
+    def _new_font(family: str, size: int, weight: str, slant: str, underline: bool) -> Font:
+        """
+        创建新的字体对象（不经过缓存）
         
-        return Font(
-            family=family or self.default_family,
-            size=size or self.default_size,
-            weight=weight,
-            slant=slant,
-            underline=underline
-        )
+        Args:
+            family: 字体族
+            size: 字号
+            weight: 字重
+            slant: 斜体
+            underline: 是否添加下划线
+            
+        Returns:
+            Font: 字体对象
+        """
+        return Font(family=family, size=size, weight=weight, slant=slant, underline=underline)
 
     @property
     def current_font(self) -> Font:
@@ -78,7 +95,9 @@ class FontManager:
         """
         if not self._current_font:
             logger.debug("创建默认字体对象")
-            self._current_font = self.create_font()
+            # 当前字体允许修改，不与缓存共享
+            self._current_font = self._new_font(
+                self.default_family, self.default_size, 'normal', 'roman', False)
         return self._current_font
 
     def update_current_font(self, **kwargs):
@@ -2,54 +2,89 @@
 日志配置模块
 
 提供统一的日志配置和格式化，支持文件和控制台输出。
+日志记录通过队列交给后台线程写出，记录日志的线程不会阻塞在文件或控制台I/O上。
 """
 
+import atexit
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_log_queue: Optional[queue.SimpleQueue] = None
+_listener: Optional[QueueListener] = None
+_init_lock = threading.Lock()
+
+
+def _get_log_queue() -> queue.SimpleQueue:
+    """
+    获取共享的日志队列
+
+    首次调用时创建文件和控制台处理器，并启动后台监听线程将队列中的日志写出。
+    所有日志记录器共用同一组处理器。
+
+    Returns:
+        queue.SimpleQueue: 日志队列
+    """
+    global _log_queue, _listener
+    with _init_lock:
+        if _log_queue is not None:
+            return _log_queue
+
+        # 创建日志目录
+        log_dir = "logs"
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        # 文件处理器
+        log_file = os.path.join(log_dir, f"{datetime.now().strftime('%Y%m%d')}.log")
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+
+        # 控制台处理器
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+
+        # 日志格式
+        formatter = logging.Formatter(
+            '%(asctime)s [%(name)s] %(levelname)s: %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+        file_handler.setFormatter(formatter)
+        console_handler.setFormatter(formatter)
+
+        # 后台线程负责实际写出，退出时先处理完队列中剩余的日志
+        _log_queue = queue.SimpleQueue()
+        _listener = QueueListener(_log_queue, file_handler, console_handler,
+                                  respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _log_queue
+
 
 def setup_logger(name: str) -> logging.Logger:
     """
     配置并返回一个日志记录器
-    
+
     Args:
         name: 日志记录器名称，通常使用模块名
-        
+
     Returns:
         logging.Logger: 配置好的日志记录器
     """
     # 创建日志记录器
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
-    
+
     # 如果已经有处理器，不重复添加
     if logger.handlers:
         return logger
-    
-    # 创建日志目录
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # 文件处理器
-    log_file = os.path.join(log_dir, f"{datetime.now().strftime('%Y%m%d')}.log")
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    
-    # 控制台处理器
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    
-    # 日志格式
-    formatter = logging.Formatter(
-        '%(asctime)s [%(name)s] %(levelname)s: %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+
+    # 日志记录只入队，由后台线程写出
+    logger.addHandler(QueueHandler(_get_log_queue()))
+
+    return logger
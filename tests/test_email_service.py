@@ -0,0 +1,120 @@
+"""
+测试邮件发送服务
+
+该测试文件用于验证EmailService预先构建的邮件可以逐个替换收件人后重复发送，
+测试中使用记录发送内容的假SMTP连接，不访问网络。
+"""
+import smtplib
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from src.services.email_service import EmailService
+
+
+def decode_subject(msg) -> str:
+    """解码邮件头中的主题"""
+    return str(make_header(decode_header(msg['Subject'])))
+
+
+class FakeSMTP:
+    """记录每次发送时收件人、主题和邮件内容的假SMTP连接"""
+
+    def __init__(self):
+        self.sent = []
+
+    def noop(self):
+        return 250, b"OK"
+
+    def quit(self):
+        pass
+
+    def send_message(self, msg):
+        self.sent.append((msg['To'], decode_subject(message_from_bytes(msg.as_bytes())), msg.as_bytes()))
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        parsed = message_from_bytes(msg)
+        self.sent.append((parsed['To'], decode_subject(parsed), msg))
+
+
+class DroppedSMTP(FakeSMTP):
+    """服务器已断开空闲连接的假SMTP连接"""
+
+    def send_message(self, msg):
+        raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+
+
+def create_service() -> EmailService:
+    """创建已连接到假SMTP服务器的邮件服务"""
+    service = EmailService("smtp.example.com", 587, "me@example.com", "secret")
+    service._server = FakeSMTP()
+    return service
+
+
+def test_send_payload_prepends_recipient():
+    """测试预先编码的邮件每次只加上收件人，其余内容保持一致"""
+    service = create_service()
+    payload = service.prepare_payload("Hello", "<p>Hi</p>", is_html=True)
+
+    assert service.send_payload(payload, "a@x.com")
+    assert service.send_payload(payload, "b@x.com")
+
+    sent = service._server.sent
+    assert [to for to, _, _ in sent] == ["a@x.com", "b@x.com"]
+    assert all(subject == "Hello" for _, subject, _ in sent)
+    assert sent[0][2].endswith(payload) and sent[1][2].endswith(payload)
+    assert b"To:" not in payload
+
+
+def test_send_payload_uses_crlf_line_endings():
+    """测试预先编码的邮件全部使用CRLF换行，不出现单独的LF"""
+    service = create_service()
+    payload = service.prepare_payload("Hello", "<p>Hi</p>\n<p>Bye</p>", is_html=True)
+
+    assert service.send_payload(payload, "a@x.com")
+
+    sent = service._server.sent[0][2]
+    assert sent.startswith(b"To: a@x.com\r\n")
+    assert b"\n" not in sent.replace(b"\r\n", b"")
+
+
+def test_send_payload_rejects_header_injection():
+    """测试收件人地址包含换行符时拒绝发送，不会注入额外的邮件头"""
+    service = create_service()
+    payload = service.prepare_payload("Hello", "Hi")
+
+    assert not service.send_payload(payload, "a@x.com\r\nBcc: evil@x.com")
+    assert not service.send_payload(payload, "a@x.com\nBcc: evil@x.com")
+    assert service._server.sent == []
+
+
+def test_send_many_yields_result_per_message():
+    """测试批量发送逐封返回结果，并复用同一个连接"""
+    service = create_service()
+    server = service._server
+    messages = [("a@x.com", "Hi A", "A", False), ("b@x.com", "Hi B", "B", False)]
+
+    results = list(service.send_many(messages))
+
+    assert results == [("a@x.com", True), ("b@x.com", True)]
+    assert service._server is server
+    assert [subject for _, subject, _ in server.sent] == ["Hi A", "Hi B"]
+
+
+def test_payload_is_single_part():
+    """测试单一正文的邮件不使用 multipart 封装，非ASCII主题按UTF-8编码"""
+    service = create_service()
+    msg = message_from_bytes(service.prepare_payload("你好", "Hi", is_html=False))
+
+    assert not msg.is_multipart()
+    assert msg.get_content_type() == "text/plain"
+    assert "=?utf-8?" in msg['Subject']
+
+
+def test_send_reconnects_once_after_disconnect(monkeypatch):
+    """测试发送时连接已断开，重新连接后重试一次"""
+    service = create_service()
+    service._server = DroppedSMTP()
+    fresh = FakeSMTP()
+    monkeypatch.setattr(service, "connect", lambda: setattr(service, "_server", fresh))
+
+    assert service.send_email("a@x.com", "Hi", "A")
+    assert [to for to, _, _ in fresh.sent] == ["a@x.com"]
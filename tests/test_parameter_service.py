@@ -0,0 +1,83 @@
+"""
+测试参数管理服务
+
+该测试文件用于验证ParameterService中自定义参数的增删，
+以及参数查询结果在参数变更后能够正确更新。
+"""
+import pytest
+from src.services.parameter_service import ParameterService
+
+
+@pytest.fixture(autouse=True)
+def clear_params():
+    """每个测试前后清空自定义参数，避免类级状态在测试间泄漏"""
+    ParameterService.clear_custom_params()
+    yield
+    ParameterService.clear_custom_params()
+
+
+def test_identifiers_follow_add_and_remove():
+    """测试参数标识符列表在增删参数后及时更新"""
+    assert ParameterService.get_custom_param_identifiers() == []
+
+    ParameterService.add_param("公司", "company")
+    assert ParameterService.get_custom_param_identifiers() == ["company"]
+
+    ParameterService.remove_param("company")
+    assert ParameterService.get_custom_param_identifiers() == []
+
+
+def test_display_names_follow_add_and_remove():
+    """测试显示名称映射在增删参数后及时更新"""
+    names = ParameterService.get_all_param_display_names()
+    assert names == {"name": "收件人姓名", "email": "邮箱地址"}
+
+    ParameterService.add_param("公司", "company")
+    assert ParameterService.get_all_param_display_names()["company"] == "公司"
+
+    ParameterService.clear_custom_params()
+    assert "company" not in ParameterService.get_all_param_display_names()
+
+
+def test_display_columns_are_cached_but_fresh_lists():
+    """测试显示列按参数缓存，且每次返回可独立修改的新列表"""
+    first = ParameterService.get_display_columns(["company"])
+    second = ParameterService.get_display_columns(["company"])
+    assert first == second == ["email", "name", "company"]
+    assert first is not second
+
+    first.append("status")
+    assert ParameterService.get_display_columns(["company"]) == ["email", "name", "company"]
+
+
+def test_params_are_case_insensitive_and_keep_order():
+    """测试参数标识符不区分大小写，且保留添加顺序和原始写法"""
+    ParameterService.add_param("公司", "Company")
+    ParameterService.add_param("城市", "city")
+
+    assert ParameterService.add_param("重复", "COMPANY")[0] is False
+    assert ParameterService.get_custom_params() == (("公司", "Company"), ("城市", "city"))
+    assert ParameterService.get_column_display_name("company") == "公司"
+
+    assert ParameterService.remove_param("CITY")
+    assert ParameterService.get_custom_param_identifiers() == ["Company"]
+
+
+def test_identifier_format():
+    """测试标识符只能包含字母、数字和下划线"""
+    assert ParameterService.validate_param_identifier("company_2", set()) == (True, "")
+    assert ParameterService.validate_param_identifier("公司", set())[0]
+    assert not ParameterService.validate_param_identifier("a-b", set())[0]
+    assert not ParameterService.validate_param_identifier("a b", set())[0]
+
+
+def test_sync_params_with_data_in_place():
+    """测试同步参数时原地删除无效列、补齐缺失列并保留状态列"""
+    data = [{"email": "a@x.com", "name": "A", "old": "1", "status": "待发送"},
+            {"email": "b@x.com", "company": "X"}]
+
+    result = ParameterService.sync_params_with_data(["company"], data)
+
+    assert result is data
+    assert data[0] == {"email": "a@x.com", "name": "A", "company": "", "status": "待发送"}
+    assert data[1] == {"email": "b@x.com", "name": "", "company": "X"}
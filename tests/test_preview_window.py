@@ -0,0 +1,19 @@
+"""
+测试邮件预览的变量替换
+
+该测试文件用于验证PreviewWindow使用格式串渲染的预览内容
+与 TemplateService.replace_variables 的替换结果一致，测试不创建窗口。
+"""
+from src.gui.components.preview_window import PreviewWindow
+from src.services.template_service import TemplateService
+
+
+def test_render_page_matches_replace_variables():
+    """测试预览渲染结果与 replace_variables 一致，包括带空格的列名"""
+    templates = ("Hi {first name}", "Dear {first name}, {name} {unknown}", "<p>{first name}</p>")
+    recipient = {"first name": "Bob", "name": "Smith", "email": "b@x.com"}
+    formats = tuple(TemplateService.compile_format(text) for text in templates)
+
+    assert PreviewWindow._render_page(formats, recipient) == \
+        tuple(TemplateService.replace_variables(text, recipient) for text in templates)
+    assert PreviewWindow._render_page(formats, recipient)[0] == "Hi Bob"
@@ -0,0 +1,92 @@
+"""
+测试收件人数据管理服务
+
+该测试文件用于验证RecipientsService的CSV导入功能，
+包括逐行填充调用方提供的列表，以及导入失败时保留原有数据。
+"""
+from src.services.recipients_service import RecipientsService
+
+
+def write_csv(path, text):
+    """写入测试用CSV文件并返回路径字符串"""
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_import_csv_fills_given_list(tmp_path):
+    """测试导入的数据逐行追加到调用方提供的列表中"""
+    file_path = write_csv(tmp_path / "ok.csv", "email,name\na@x.com,A\nb@x.com,B\n")
+    service = RecipientsService()
+    rows = []
+
+    success, error_msg, data = service.import_csv(file_path, rows)
+
+    assert success and error_msg == ""
+    assert data is rows
+    assert [r['email'] for r in rows] == ["a@x.com", "b@x.com"]
+    assert all(r['status'] == "待发送" for r in rows)
+    assert service.get_recipients() is rows
+
+
+def test_import_csv_failure_keeps_existing_data(tmp_path):
+    """测试导入失败时不替换已有的收件人数据"""
+    service = RecipientsService()
+    service.import_csv(write_csv(tmp_path / "ok.csv", "email,name\na@x.com,A\n"))
+    existing = service.get_recipients()
+
+    success, _, _ = service.import_csv(write_csv(tmp_path / "bad.csv", "foo\n1\n"))
+    assert not success
+    success, error_msg, _ = service.import_csv(write_csv(tmp_path / "empty.csv", ""))
+    assert not success and error_msg == "CSV文件为空"
+
+    assert service.get_recipients() is existing
+
+
+def test_update_status_by_index(tmp_path):
+    """测试按索引更新状态，重复邮箱的每一行都可以单独更新"""
+    file_path = write_csv(tmp_path / "dup.csv", "email,name\na@x.com,A\na@x.com,B\n")
+    service = RecipientsService()
+    service.import_csv(file_path)
+
+    assert service.get_recipient_count() == 2
+    assert service.update_status_by_index(1, "已发送")
+    assert not service.update_status_by_index(2, "已发送")
+    assert [r['status'] for r in service.get_recipients()] == ["待发送", "已发送"]
+
+
+def test_save_csv_writes_only_given_columns(tmp_path):
+    """测试保存CSV时只按给定顺序写出指定的列"""
+    service = RecipientsService()
+    service.import_csv(write_csv(tmp_path / "in.csv", "email,name\na@x.com,A\nb@x.com,B\n"))
+
+    out_path = tmp_path / "out.csv"
+    assert service.save_csv(str(out_path), ["name", "email"]) == (True, "")
+    assert out_path.read_text(encoding='utf-8').splitlines() == ["name,email", "A,a@x.com", "B,b@x.com"]
+
+
+def test_update_status_by_email_follows_edits(tmp_path):
+    """测试按邮箱更新状态时命中第一条记录，且编辑邮箱后索引随之更新"""
+    file_path = write_csv(tmp_path / "dup.csv", "email,name\na@x.com,A\na@x.com,B\nc@x.com,C\n")
+    service = RecipientsService()
+    service.import_csv(file_path)
+
+    assert service.update_status("a@x.com", "已发送")
+    assert [r['status'] for r in service.get_recipients()] == ["已发送", "待发送", "待发送"]
+
+    service.update_recipient(0, {'email': "d@x.com", 'name': "A", 'status': "已发送"})
+    assert service.update_status("a@x.com", "发送失败")
+    assert service.update_status("d@x.com", "待发送")
+    assert not service.update_status("missing@x.com", "已发送")
+    assert [r['status'] for r in service.get_recipients()] == ["待发送", "发送失败", "待发送"]
+
+
+def test_validate_template_params_ignores_case(tmp_path):
+    """测试模板参数验证不区分大小写，且编辑第一条数据后使用新的列名"""
+    service = RecipientsService()
+    service.import_csv(write_csv(tmp_path / "ok.csv", "Email,Name,Company\na@x.com,A,X\n"))
+
+    assert service.validate_template_params({"name", "COMPANY"}) == (True, set())
+    assert service.validate_template_params({"city"}) == (False, {"city"})
+
+    service.update_recipient(0, {'Email': "a@x.com", 'Name': "A", 'City': "Y"})
+    assert service.validate_template_params({"city"}) == (True, set())
@@ -4,105 +4,183 @@
 该测试文件用于验证TemplateService中get_html_content方法，
 测试不同格式标签对HTML生成的影响。
 """
+from types import MappingProxyType
 import pytest
 from src.services.template_service import TemplateService
 
 
-def create_service(content: str, tags: dict, subject: str = "") -> TemplateService:
+@pytest.fixture(scope="module")
+def service() -> TemplateService:
+    """整个模块共用一个TemplateService实例，各测试通过 update_template 重置模板数据"""
+    return TemplateService()
+
+
+def load_template(service: TemplateService, content: str, tags: dict, subject: str = "") -> None:
     """
-    辅助函数，用于创建并初始化TemplateService实例。
+    辅助函数，用于以给定内容重置共用的TemplateService实例。
+
+    update_template 会替换全部模板数据，前一个测试留下的状态不会影响结果。
 
     Args:
+        service: 共用的模板服务实例
         content: 文本内容
         tags: 格式标签字典
         subject: 邮件主题
-
-    Returns:
-        TemplateService: 初始化后的模板服务实例
     """
-    service = TemplateService()
     # 使用默认字体设置Times New Roman, 12pt
     service.update_template(subject=subject, content=content, is_html=True, tags=tags, font_family="Times New Roman", font_size="12")
-    return service
-
-
-def test_get_html_content_basic():
-    """测试基本的HTML内容生成"""
-    content = "Hello World"
-    tags = {}
-    service = create_service(content, tags)
-    html = service.get_html_content()
-    
-    assert "Hello&nbsp;World" in html
-    assert "<body" in html
-    assert "</body>" in html
-    assert "<p" in html
-    assert "</p>" in html
 
 
-def test_get_html_content_with_bold():
-    """测试带有粗体格式的HTML内容生成
-
-    对于'Hello'，设置索引0-4的字符为bold格式。"""
-    content = "Hello World"
-    tags = {str(i): ["bold"] for i in range(0, 5)}
-    service = create_service(content, tags)
+# 'Hello'（索引0-4）的格式标签，模块加载时构建一次，以只读映射在测试间共用
+BOLD_TAGS = MappingProxyType({str(i): ["bold"] for i in range(0, 5)})
+BOLD_ITALIC_TAGS = MappingProxyType({str(i): ["bold", "italic"] for i in range(0, 5)})
+FONT_TAGS = MappingProxyType({str(i): ["font-family:Arial", "font-size:14"] for i in range(0, 5)})
+# TemplatePanel.get_template_config 生成的整数位置键；'World'（索引6-10）为斜体
+INT_KEY_TAGS = MappingProxyType({i: ["italic"] for i in range(6, 11)})
+
+# (文本内容, 格式标签, 应包含的片段, 段落标签数量)，段落数量为 None 时不检查
+HTML_CASES = [
+    pytest.param(
+        "Hello World", {},
+        ("Hello&nbsp;World", "<body", "</body>", "<p", "</p>"), None,
+        id="basic"),
+    # 'Hello'（索引0-4）为粗体，应存在带有font-weight: bold的span标签，'World'部分未被格式化
+    pytest.param(
+        "Hello World", BOLD_TAGS,
+        ('<span style="font-weight: bold', "World"), None,
+        id="bold"),
+    # 'Hello'同时为粗体和斜体
+    pytest.param(
+        "Hello World", BOLD_ITALIC_TAGS,
+        ("font-weight: bold", "font-style: italic", "Hello", "World"), None,
+        id="multiple_formats"),
+    # 'Hello'带有Arial字体和14pt字号
+    pytest.param(
+        "Hello World", FONT_TAGS,
+        ("<span style=\"font-family: 'Arial'; font-size: 14pt\">Hello</span>", "World"), None,
+        id="font"),
+    # 整数位置键与字符串位置键效果相同
+    pytest.param(
+        "Hello World", INT_KEY_TAGS,
+        ('Hello&nbsp;<span style="font-style: italic">World</span>',), None,
+        id="int_keys"),
+    # 文本包含换行符，应生成两个段落
+    pytest.param(
+        "Hello\nWorld", {},
+        ("Hello", "World"), 2,
+        id="newlines"),
+    # 文本包含空行，空行中应包含&nbsp;字符，且应生成三个段落
+    pytest.param(
+        "Hello\n\nWorld", {},
+        ("&nbsp;",), 3,
+        id="empty_lines"),
+]
+
+
+@pytest.mark.parametrize("content,tags,expected_parts,p_count", HTML_CASES)
+def test_get_html_content(service, content, tags, expected_parts, p_count):
+    """测试不同文本内容和格式标签生成的HTML内容"""
+    load_template(service, content, tags)
     html = service.get_html_content()
-    # 应该存在带有font-weight: bold的span标签包裹'Hello'
-    assert '<span style="font-weight: bold' in html
-    # 'World'部分应该未被格式化
-    assert "World" in html
-
 
-def test_get_html_content_with_multiple_formats():
-    """测试多种格式组合的HTML内容生成
+    missing = [part for part in expected_parts if part not in html]
+    assert not missing
+    if p_count is not None:
+        assert html.count("<p") == p_count
 
-    对于'Hello'，设置索引0-4的字符同时为bold和italic格式。"""
-    content = "Hello World"
-    tags = {str(i): ["bold", "italic"] for i in range(0, 5)}
-    service = create_service(content, tags)
-    html = service.get_html_content()
-    assert 'font-weight: bold' in html
-    assert 'font-style: italic' in html
-    assert "Hello" in html
-    assert "World" in html
 
+def test_replace_variables():
+    """测试模板变量替换
 
-def test_get_html_content_with_font():
-    """测试带有字体设置的HTML内容生成
+    已知变量被替换，未知变量保持原样，替换结果中的花括号不会被再次替换。"""
+    result = TemplateService.replace_variables(
+        "{name} <{email}> {unknown}",
+        {"name": "{email}", "email": "a@b.com"}
+    )
+    assert result == "{email} <a@b.com> {unknown}"
 
-    对于'Hello'，设置索引0-4的字符带有Arial字体和14pt字号。"""
-    content = "Hello World"
-    tags = {str(i): ["font-family:Arial", "font-size:14"] for i in range(0, 5)}
-    service = create_service(content, tags)
-    html = service.get_html_content()
-    expected = "<span style=\"font-family: 'Arial'; font-size: 14pt\">Hello</span>"
-    assert expected in html
-    assert "World" in html
 
+def test_get_template_tracks_updates(service):
+    """测试模板数据在更新后重新生成，未更新时复用"""
+    load_template(service, "Hello", {})
+    template = service.get_template()
+    assert service.get_template() is template
 
-def test_get_html_content_with_newlines():
-    """测试带有换行符的HTML内容生成
-
-    文本包含换行符，应生成对应的段落标签。"""
-    content = "Hello\nWorld"
-    tags = {}
-    service = create_service(content, tags)
-    html = service.get_html_content()
-    # 应该有两个段落标签<p>
-    assert html.count("<p") == 2
-    assert "Hello" in html
-    assert "World" in html
-
+    service.update_template(subject="Hi", content="World", is_html=False, tags={},
+                            font_family="Arial", font_size="14")
+    template = service.get_template()
+    assert template['subject'] == "Hi"
+    assert template['content'] == "World"
+    assert template['is_html'] is False
 
-def test_get_html_content_with_empty_lines():
-    """测试带有空行的HTML内容生成
 
-    文本包含空行，空行中应包含&nbsp;字符，且段落数量应正确。"""
-    content = "Hello\n\nWorld"
-    tags = {}
-    service = create_service(content, tags)
+def test_html_content_cached_until_update(service):
+    """测试HTML内容在模板未更新时复用，更新文本后重新生成"""
+    load_template(service, "Hello", {})
     html = service.get_html_content()
-    # 应该有三个<p>标签
-    assert html.count("<p") == 3
-    assert "&nbsp;" in html 
\ No newline at end of file
+    assert service.get_html_content() is html
+
+    service.update_text("", "World")
+    assert "World" in service.get_html_content()
+
+
+def test_compiled_template_follows_updates(service):
+    """测试参数集合与格式串按版本缓存，模板更新后重新生成"""
+    load_template(service, "Hi {name}", {}, subject="{company}")
+    assert service.get_template_param_set() == {"name", "company"}
+    compiled = service.get_compiled_template()
+    assert service.get_compiled_template() is compiled
+    subject_format, content_format = compiled
+    assert TemplateService.render_format(subject_format, {"company": "ACME"}) == "ACME"
+    assert "Hi&nbsp;Bob" in TemplateService.render_format(content_format, {"name": "Bob"})
+
+    service.update_text("Hello", "Bye")
+    assert service.get_template_param_set() == set()
+    assert service.get_compiled_template()[0] == "Hello"
+
+
+def test_update_text_only_bumps_version_on_change(service):
+    """测试仅更新文本时保留格式设置，文本未变化时版本号不变"""
+    tags = MappingProxyType({"0": ["bold"]})
+    load_template(service, "Hello", tags)
+    version = service.version
+
+    service.update_text(service.get_template()['subject'], "Hello")
+    assert service.version == version
+
+    service.update_text("Hi", "Hello World")
+    template = service.get_template()
+    assert service.version == version + 1
+    assert template['subject'] == "Hi"
+    assert template['content'] == "Hello World"
+    assert template['tags'] == {"0": ["bold"]}
+    assert template['tags'] is tags
+
+
+def test_render_format_matches_replace_variables():
+    """测试格式串替换与 replace_variables 的结果一致
+
+    花括号字面量、未知变量和非法占位符都应原样保留。"""
+    template = "{name}: {{id}} {unknown} {} {a.b} } {"
+    variables = {"name": "Alice", "id": "42"}
+    template_format = TemplateService.compile_format(template)
+    assert TemplateService.render_format(template_format, variables) == \
+        TemplateService.replace_variables(template, variables)
+
+
+def test_render_format_handles_digit_names():
+    """测试纯数字变量名与 replace_variables 的结果一致，未定义时保持原样"""
+    template = "Hi {123} {4}{name}"
+    variables = {"123": "X", "name": "Bob"}
+    template_format = TemplateService.compile_format(template)
+    assert TemplateService.render_format(template_format, variables) == \
+        TemplateService.replace_variables(template, variables) == "Hi X {4}Bob"
+
+
+def test_render_format_handles_non_word_names():
+    """测试含空格、连字符等字符的变量名（如CSV列名）与 replace_variables 的结果一致"""
+    template = "Hi {first name} <{e-mail}> {a.b} {x:y} {missing key}"
+    variables = {"first name": "Bob", "e-mail": "b@x.com", "a.b": "1", "x:y": "2"}
+    template_format = TemplateService.compile_format(template)
+    assert TemplateService.render_format(template_format, variables) == \
+        TemplateService.replace_variables(template, variables) == "Hi Bob <b@x.com> 1 2 {missing key}"